@@ -0,0 +1,160 @@
+"""
+Scaling benchmark for the training pipeline on synthetic data.
+
+For each dataset size, generates a synthetic CSV fitted to the real data, then
+times load_data -> validate_schema -> add_features and fit/predict for every
+ModelSpec, recording wall time and peak traced memory per stage.
+
+Each stage runs twice: a timed run without tracing (tracemalloc slows
+allocation-heavy stages considerably, which would inflate seconds and
+rows/second), then a run under tracemalloc for the peak. tracemalloc sees
+numpy/pandas buffers but not every native allocation, so the process max RSS
+is recorded alongside it. --no-memory skips the traced runs.
+
+A model is skipped at larger sizes once one of its stages exceeded
+--time-budget seconds, so the first stage to break shows up as the last
+measured row.
+
+Usage:
+    python scripts/benchmark_scaling.py --config configs/train.yaml \
+        --sizes 10000 100000 1000000 --models rf xgboost
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import pandas as pd
+import yaml
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from maternal_risk.data.load_data import load_data
+from maternal_risk.data.synthetic import fit_synthesizer, write_synthetic
+from maternal_risk.data.validate import validate_schema
+from maternal_risk.features.build_features import add_features
+from maternal_risk.models.compare import LABELS, build_pipeline
+from maternal_risk.models.registry import get_model_specs
+
+
+def measure(fn, *args, trace_memory=True, **kwargs):
+    """
+    Return (result, wall seconds, peak traced MiB or None). The time comes
+    from an untraced run; the peak from a second run under tracemalloc.
+    """
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    if not trace_memory:
+        return result, seconds, None
+
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+
+def max_rss_mib():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux (bytes on macOS)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--models", nargs="*", default=None, help="Model keys (default: all)")
+    parser.add_argument("--time-budget", type=float, default=600.0, help="Seconds per stage")
+    parser.add_argument("--out", type=str, default=None, help="Default: <report_dir>/benchmarks")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced runs (timings only)"
+    )
+    args = parser.parse_args()
+    trace = not args.no_memory
+
+    cfg = yaml.safe_load(Path(args.config).read_text())
+    random_state = int(cfg["train"]["random_state"])
+    out_dir = Path(args.out or Path(cfg["output"]["report_dir"]) / "benchmarks")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    synth = fit_synthesizer(load_data(cfg["data"]["raw_path"]))
+    model_keys = args.models or list(get_model_specs(random_state=random_state))
+    label_encoder = LabelEncoder().fit(LABELS)
+    over_budget: set[str] = set()
+    rows = []
+
+    def record(n_rows, stage, seconds, peak_mib, model_key=""):
+        row = {
+            "n_rows": n_rows,
+            "stage": stage,
+            "model_key": model_key,
+            "seconds": round(seconds, 4),
+            "peak_mib": round(peak_mib, 1) if peak_mib is not None else None,
+            "max_rss_mib": max_rss_mib(),
+            "rows_per_second": round(n_rows / seconds) if seconds > 0 else None,
+        }
+        rows.append(row)
+        print(json.dumps(row))
+        if seconds > args.time_budget:
+            over_budget.add(model_key or stage)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sorted(args.sizes):
+            csv_path = Path(tmp) / f"synthetic_{n_rows}.csv"
+            write_synthetic(synth, n_rows, csv_path, seed=random_state)
+
+            df, s, m = measure(load_data, csv_path, trace_memory=trace)
+            record(n_rows, "load_data", s, m)
+            result, s, m = measure(validate_schema, df, trace_memory=trace)
+            record(n_rows, "validate_schema", s, m)
+            if not result.ok:
+                raise ValueError(f"Synthetic data failed validation: {result.errors}")
+            df, s, m = measure(add_features, df, trace_memory=trace)
+            record(n_rows, "add_features", s, m)
+
+            df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
+            X = df.drop(columns=["RiskLevel"])
+            y = label_encoder.transform(df["RiskLevel"])
+
+            for model_key in model_keys:
+                if model_key in over_budget:
+                    print(f"Skipping {model_key} at {n_rows:,} rows (over time budget).")
+                    continue
+                spec = get_model_specs(random_state=random_state)[model_key]
+                pipeline = build_pipeline(spec.needs_scaling, spec.estimator)
+                _, s, m = measure(pipeline.fit, X, y, trace_memory=trace)
+                record(n_rows, "fit", s, m, model_key)
+                _, s, m = measure(pipeline.predict, X, trace_memory=trace)
+                record(n_rows, "predict", s, m, model_key)
+
+            csv_path.unlink()
+            if over_budget & {"load_data", "validate_schema", "add_features"}:
+                print("Data stages exceeded the time budget; stopping.")
+                break
+
+    results = pd.DataFrame(rows)
+    results.to_csv(out_dir / "scaling.csv", index=False)
+    (out_dir / "scaling.json").write_text(results.to_json(orient="records", indent=2))
+    print(f"\nSaved: {out_dir / 'scaling.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Thread-allocation benchmark: trains every ModelSpec on synthetic data under
+different CPU allocations and records the wall time of the whole run.
+
+Allocations:
+- naive:       one worker per core, every estimator n_jobs=-1 and unrestricted
+               OpenMP/BLAS pools (outer x inner threads oversubscribe the CPUs)
+- defaults:    models one after another with library defaults
+- budget_<k>:  k models side by side, cpus // k threads each (n_jobs and
+               threadpoolctl limits), as used by compare.py --n-jobs k
+
+Usage:
+    python scripts/benchmark_threads.py --config configs/train.yaml --rows 200000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import yaml
+from joblib import Parallel, delayed
+from sklearn.preprocessing import LabelEncoder
+from threadpoolctl import threadpool_limits
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from maternal_risk.data.load_data import load_data
+from maternal_risk.data.synthetic import fit_synthesizer, write_synthetic
+from maternal_risk.features.build_features import add_features
+from maternal_risk.models.compare import LABELS, build_pipeline
+from maternal_risk.models.registry import get_model_specs
+from maternal_risk.models.resources import ThreadBudget, budget_from_config
+
+
+def fit_one(model_key, X, y, random_state, n_jobs, thread_limit):
+    spec = get_model_specs(random_state=random_state, n_jobs=n_jobs)[model_key]
+    pipeline = build_pipeline(spec.needs_scaling, spec.estimator)
+    with threadpool_limits(limits=thread_limit):  # None leaves the pools untouched
+        pipeline.fit(X, y)
+    return model_key
+
+
+def run_allocation(model_keys, X, y, random_state, outer_jobs, n_jobs, thread_limit):
+    start = time.perf_counter()
+    Parallel(n_jobs=outer_jobs)(
+        delayed(fit_one)(key, X, y, random_state, n_jobs, thread_limit) for key in model_keys
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows to train on")
+    parser.add_argument("--models", nargs="*", default=None, help="Model keys (default: all)")
+    parser.add_argument(
+        "--outer", type=int, nargs="*", default=None, help="Budgeted outer_jobs values to try"
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per allocation (best kept)")
+    parser.add_argument("--out", type=str, default=None, help="Default: <report_dir>/benchmarks")
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(Path(args.config).read_text())
+    random_state = int(cfg["train"]["random_state"])
+    out_dir = Path(args.out or Path(cfg["output"]["report_dir"]) / "benchmarks")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    configured = budget_from_config(cfg)
+    cpus = configured.cpus
+    model_keys = args.models or list(get_model_specs(random_state=random_state))
+
+    synth = fit_synthesizer(load_data(cfg["data"]["raw_path"]))
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_synthetic(synth, args.rows, Path(tmp) / "synthetic.csv", seed=random_state)
+        df = add_features(load_data(csv_path))
+    df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
+    X = df.drop(columns=["RiskLevel"])
+    y = LabelEncoder().fit(LABELS).transform(df["RiskLevel"])
+
+    # name -> (outer_jobs, estimator n_jobs, threadpool limit)
+    allocations = {
+        "naive": (cpus, -1, None),
+        "defaults": (1, None, None),
+    }
+    for outer in sorted(set(args.outer or [1, configured.outer_jobs, min(len(model_keys), cpus)])):
+        budget = ThreadBudget(cpus=cpus, outer_jobs=max(1, min(outer, cpus)))
+        allocations[f"budget_{budget.outer_jobs}"] = (
+            budget.outer_jobs,
+            budget.inner_threads,
+            budget.inner_threads,
+        )
+
+    rows = []
+    for name, (outer_jobs, n_jobs, thread_limit) in allocations.items():
+        seconds = min(
+            run_allocation(model_keys, X, y, random_state, outer_jobs, n_jobs, thread_limit)
+            for _ in range(args.repeats)
+        )
+        row = {
+            "allocation": name,
+            "cpus": cpus,
+            "outer_jobs": outer_jobs,
+            "n_jobs": n_jobs,
+            "thread_limit": thread_limit,
+            "n_rows": args.rows,
+            "seconds": round(seconds, 3),
+        }
+        rows.append(row)
+        print(json.dumps(row))
+
+    results = pd.DataFrame(rows).sort_values("seconds")
+    naive = results.loc[results["allocation"] == "naive", "seconds"].iloc[0]
+    results["speedup_vs_naive"] = (naive / results["seconds"]).round(2)
+    results.to_csv(out_dir / "threads.csv", index=False)
+    (out_dir / "threads.json").write_text(results.to_json(orient="records", indent=2))
+
+    print(f"\nFastest allocation on {cpus} CPU(s): {results.iloc[0]['allocation']}")
+    print(results[["allocation", "outer_jobs", "n_jobs", "seconds", "speedup_vs_naive"]])
+    print(f"\nSaved: {out_dir / 'threads.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 import pandas as pd
 
+from maternal_risk.features.build_features import FEATURE_COLUMNS
+
+PREDICTION_LOG_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+LABEL_SOURCES = ("confirmed", "served")
+
 
 def load_data(csv_path: str | Path) -> pd.DataFrame:
     """
     Load the maternal health dataset from a CSV file.
 
+    A SQLite prediction log written by the web app (``.db``/``.sqlite``/``.sqlite3``)
+    is also accepted: only rows with a confirmed outcome are returned, and a log
+    without any raises ValueError; see `load_prediction_log`.
+
     Parameters
     ----------
     csv_path : str | Path
@@ -23,9 +33,84 @@ def load_data(csv_path: str | Path) -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path.resolve()}")
 
-    df = pd.read_csv(csv_path)
+    if csv_path.suffix.lower() in PREDICTION_LOG_SUFFIXES:
+        df = load_prediction_log(csv_path)
+        if df.empty:
+            raise ValueError(f"No predictions with a confirmed outcome in {csv_path}.")
+    else:
+        df = pd.read_csv(csv_path)
 
     if df.empty:
         raise ValueError("Loaded dataframe is empty. Check the CSV content.")
 
     return df
+
+
+def load_prediction_log(
+    db_path: str | Path,
+    since: float | None = None,
+    model_version: str | None = None,
+    include_metadata: bool = False,
+    label_source: str = "confirmed",
+) -> pd.DataFrame:
+    """
+    Read the web app's prediction log (webapp/prediction_log.py) as a dataset.
+
+    Parameters
+    ----------
+    db_path : str | Path
+        Path to the SQLite prediction log.
+    since : float | None
+        Only rows logged at or after this UNIX timestamp.
+    model_version : str | None
+        Only rows served by this model version (e.g. "rf@0123456789ab").
+    include_metadata : bool
+        Also return id, ts, model_version, probabilities and latency_ms.
+    label_source : str
+        "confirmed" (default): RiskLevel is the observed outcome
+        (``confirmed_label``); rows without one are skipped.
+        "served": RiskLevel is the model's own prediction. For analysing
+        served traffic only; training on it feeds the model its own outputs.
+
+    Returns
+    -------
+    pd.DataFrame
+        Feature columns plus RiskLevel in the training format ("low risk", ...).
+    """
+    if label_source not in LABEL_SOURCES:
+        raise ValueError(f"Unknown label_source '{label_source}'. Available: {LABEL_SOURCES}")
+
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"Prediction log not found: {db_path.resolve()}")
+
+    label_column = "confirmed_label" if label_source == "confirmed" else "risk_level"
+    clauses, params = [], []
+    if label_source == "confirmed":
+        clauses.append("confirmed_label IS NOT NULL")
+    if since is not None:
+        clauses.append("ts >= ?")
+        params.append(since)
+    if model_version is not None:
+        clauses.append("model_version = ?")
+        params.append(model_version)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with sqlite3.connect(db_path) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(predictions)")]
+        if label_column not in columns:
+            raise ValueError(
+                f"{db_path} has no {label_column} column: it holds served predictions "
+                "only. Record confirmed outcomes, or pass label_source='served' "
+                "explicitly (not for training)."
+            )
+        df = pd.read_sql_query(f"SELECT * FROM predictions{where} ORDER BY id", conn, params=params)
+
+    # Served labels are "Low"/"Low Risk"; training labels are "low risk"
+    risk = df[label_column].str.strip().str.lower().str.replace(" risk", "", regex=False)
+    df["RiskLevel"] = risk + " risk"
+
+    columns = [*FEATURE_COLUMNS, "RiskLevel"]
+    if include_metadata:
+        columns = ["id", "ts", "model_version", *columns, "probabilities", "latency_ms"]
+    return df[columns]
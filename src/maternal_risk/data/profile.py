@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from maternal_risk.features.build_features import FEATURE_COLUMNS
+
+
+def build_reference_profile(X: pd.DataFrame, y, n_bins: int = 10) -> dict:
+    """
+    Summarize the training inputs for drift monitoring.
+
+    Per feature: interior bin edges at the training quantiles and the share of
+    training rows in each bin (len(edges) + 1 bins, the outer ones open-ended).
+    Per class: the share of training labels and, per feature, the share of
+    that class's rows in each of the same bins.
+    """
+    labels = pd.Series(np.asarray(y), index=X.index).astype(str)
+    features = {}
+    by_class: dict[str, dict] = {str(c): {} for c in sorted(labels.unique())}
+    for col in FEATURE_COLUMNS:
+        values = X[col].to_numpy(dtype=float)
+        qs = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+        edges = np.unique(qs)
+        # side="right": a value equal to an edge goes to the bin above it
+        bins = np.searchsorted(edges, values, side="right")
+        counts = np.bincount(bins, minlength=len(edges) + 1)
+        features[col] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / counts.sum()).tolist(),
+        }
+        for label, per_feature in by_class.items():
+            class_counts = np.bincount(
+                bins[(labels == label).to_numpy()], minlength=len(edges) + 1
+            )
+            per_feature[col] = (class_counts / class_counts.sum()).tolist()
+
+    classes = labels.value_counts(normalize=True).sort_index()
+
+    return {
+        "n_rows": len(X),
+        "features": features,
+        "classes": {str(k): float(v) for k, v in classes.items()},
+        "by_class": by_class,
+    }
+
+
+def save_reference_profile(profile: dict, out_path: str | Path) -> Path:
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(profile, indent=2))
+    return out_path
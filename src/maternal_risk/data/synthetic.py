@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from maternal_risk.data.load_data import load_data
+from maternal_risk.data.validate import validate_schema
+from maternal_risk.features.build_features import FEATURE_COLUMNS
+
+
+def _decimals(values: pd.Series, max_decimals: int = 3) -> int:
+    """Smallest number of decimals that represents every value (the data's resolution)."""
+    for d in range(max_decimals + 1):
+        if np.allclose(values, values.round(d)):
+            return d
+    return max_decimals
+
+
+def fit_synthesizer(df: pd.DataFrame) -> dict:
+    """
+    Fit per-class joint distributions to the real dataset.
+
+    Each RiskLevel gets its prior, mean vector and covariance matrix over the
+    numeric features (a multivariate Gaussian keeps the correlations, e.g.
+    between systolic and diastolic BP). Observed ranges and value resolution
+    are kept so samples can be clipped and rounded like the real data.
+    """
+    result = validate_schema(df)
+    if not result.ok:
+        raise ValueError(f"Data validation failed: {result.errors}")
+
+    df = df.copy()
+    df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
+    X = df[FEATURE_COLUMNS].astype(float)
+
+    classes = {}
+    for label, group in X.groupby(df["RiskLevel"]):
+        classes[label] = {
+            "prior": len(group) / len(X),
+            "mean": group.mean().to_numpy(),
+            "cov": np.cov(group.to_numpy(), rowvar=False),
+        }
+
+    return {
+        "classes": classes,
+        "min": X.min().to_numpy(),
+        "max": X.max().to_numpy(),
+        "decimals": [_decimals(X[c]) for c in FEATURE_COLUMNS],
+    }
+
+
+def generate_chunks(
+    synth: dict, n_rows: int, chunk_size: int = 1_000_000, seed: int = 42
+) -> Iterator[pd.DataFrame]:
+    """Yield synthetic rows (REQUIRED_COLUMNS schema) in chunks of at most `chunk_size`."""
+    rng = np.random.default_rng(seed)
+    labels = list(synth["classes"])
+    priors = np.array([synth["classes"][c]["prior"] for c in labels])
+
+    for start in range(0, n_rows, chunk_size):
+        n = min(chunk_size, n_rows - start)
+        counts = rng.multinomial(n, priors)
+
+        parts, targets = [], []
+        for label, k in zip(labels, counts):
+            params = synth["classes"][label]
+            parts.append(rng.multivariate_normal(params["mean"], params["cov"], size=k))
+            targets.append(np.full(k, label, dtype=object))
+
+        values = np.clip(np.vstack(parts), synth["min"], synth["max"])
+        chunk = pd.DataFrame(values, columns=FEATURE_COLUMNS)
+        for col, d in zip(FEATURE_COLUMNS, synth["decimals"]):
+            chunk[col] = chunk[col].round(d).astype(int) if d == 0 else chunk[col].round(d)
+        chunk["RiskLevel"] = np.concatenate(targets)
+
+        # Shuffle so classes are interleaved like in the real file
+        yield chunk.sample(frac=1, random_state=int(rng.integers(2**31))).reset_index(drop=True)
+
+
+def write_synthetic(
+    synth: dict, n_rows: int, out_path: str | Path, chunk_size: int = 1_000_000, seed: int = 42
+) -> Path:
+    """Stream synthetic rows to CSV or Parquet (by file suffix) without holding them in memory."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if out_path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in generate_chunks(synth, n_rows, chunk_size, seed):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for i, chunk in enumerate(generate_chunks(synth, n_rows, chunk_size, seed)):
+            chunk.to_csv(out_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+    return out_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
+    parser.add_argument("--rows", type=int, required=True, help="Number of rows to generate")
+    parser.add_argument(
+        "--out", type=str, required=True, help="Output file (.csv or .parquet)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None, help="Default: train.random_state")
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(Path(args.config).read_text())
+    seed = args.seed if args.seed is not None else int(cfg["train"]["random_state"])
+
+    synth = fit_synthesizer(load_data(cfg["data"]["raw_path"]))
+    out_path = write_synthetic(synth, args.rows, args.out, args.chunk_size, seed)
+    print(f"Wrote {args.rows:,} synthetic rows to: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
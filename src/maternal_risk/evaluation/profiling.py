@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import platform
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    stage: str
+    model_key: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_mib: float
+
+
+class StageProfiler:
+    """
+    Per-stage wall time, CPU time and peak traced memory for a pipeline run.
+
+    Wrap each stage in `with profiler.stage("fit", model_key):`. When disabled
+    the context manager does nothing, so scripts can use it unconditionally.
+    With `cprofile_dir`, each stage also dumps cProfile stats to
+    <cprofile_dir>/<model_key>_<stage>.prof (open with `python -m pstats` or snakeviz).
+
+    CPU time is process time, so it includes threads the stage starts in this
+    process but not joblib/loky worker processes. tracemalloc adds overhead to
+    allocation-heavy stages; compare timings between profiled runs only.
+    """
+
+    def __init__(self, enabled: bool = True, cprofile_dir: str | Path | None = None):
+        self.enabled = enabled
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.timings: list[StageTiming] = []
+
+    @contextmanager
+    def stage(self, name: str, model_key: str = "") -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+
+        profile = None
+        if self.cprofile_dir is not None:
+            profile = cProfile.Profile()
+            profile.enable()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            if profile is not None:
+                profile.disable()
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                prefix = f"{model_key}_" if model_key else ""
+                profile.dump_stats(self.cprofile_dir / f"{prefix}{name}.prof")
+
+            self.timings.append(StageTiming(name, model_key, wall, cpu, peak / 2**20))
+
+    def totals(self) -> dict[str, dict[str, float]]:
+        """Stage -> summed wall/CPU seconds and max peak MiB (over models)."""
+        totals: dict[str, dict[str, float]] = {}
+        for t in self.timings:
+            entry = totals.setdefault(
+                t.stage, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_mib": 0.0}
+            )
+            entry["wall_seconds"] += t.wall_seconds
+            entry["cpu_seconds"] += t.cpu_seconds
+            entry["peak_mib"] = max(entry["peak_mib"], t.peak_mib)
+        return totals
+
+    def report(self, **context) -> dict:
+        return {
+            **context,
+            "python": platform.python_version(),
+            "created_at": time.time(),
+            "stages": [asdict(t) for t in self.timings],
+            "totals": self.totals(),
+        }
+
+    def save(self, path: str | Path, **context) -> Path:
+        """Write the JSON timing report; `context` (command, model, ...) goes at the top."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(**context), indent=2))
+        return path
+
+    def log_to_mlflow(self) -> None:
+        """Log stage totals as metrics, e.g. stage_fit_wall_seconds (for trends across runs)."""
+        import mlflow
+
+        for stage, values in self.totals().items():
+            for name, value in values.items():
+                mlflow.log_metric(f"stage_{stage}_{name}", value)
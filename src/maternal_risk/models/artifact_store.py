@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import joblib
+import sklearn
+
+import mlflow
+
+
+@dataclass(frozen=True)
+class StoredArtifact:
+    sha256: str
+    store_path: Path
+    model_path: Path
+    manifest_path: Path
+    manifest: dict
+
+
+def file_sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def manifest_path_for(model_path: str | Path) -> Path:
+    """models/rf.joblib -> models/rf.manifest.json"""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.manifest.json")
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem / no hard-link support: fall back to a copy
+        shutil.copy2(src, dst)
+
+
+def save_pipeline(
+    pipeline,
+    model_path: str | Path,
+    store_dir: str | Path,
+    label_names: list[str],
+    training_data_sha256: str | None = None,
+    compress: int = 3,
+    extra: dict | None = None,
+) -> StoredArtifact:
+    """
+    Serialize a fitted pipeline once and store it by content hash.
+
+    The compressed joblib file lives at <store_dir>/<sha256>.joblib (identical
+    pipelines are stored once). `model_path` (e.g. models/rf.joblib) is a hard
+    link to it, next to a manifest the web app checks at load time.
+
+    `label_names[i]` is the label of model output class `pipeline.classes_[i]`.
+    """
+    # Validate before writing anything, so a bad call never leaves
+    # models/<key>.joblib pointing at a new file next to a stale manifest
+    classes = [c.item() if hasattr(c, "item") else c for c in pipeline.classes_]
+    if len(label_names) != len(classes):
+        raise ValueError(f"Got {len(label_names)} label names for {len(classes)} classes.")
+
+    store_dir = Path(store_dir)
+    model_path = Path(model_path)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=store_dir, suffix=".joblib.tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        joblib.dump(pipeline, tmp_path, compress=compress)
+        tmp_path.chmod(0o644)  # mkstemp creates owner-only files
+        sha256 = file_sha256(tmp_path)
+        store_path = store_dir / f"{sha256}.joblib"
+        if store_path.exists():
+            tmp_path.unlink()
+        else:
+            tmp_path.replace(store_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    _link_or_copy(store_path, model_path)
+
+    manifest = {
+        "sha256": sha256,
+        "store_path": str(store_path),
+        "feature_names": [str(f) for f in getattr(pipeline, "feature_names_in_", [])],
+        "classes": classes,
+        "label_names": list(label_names),
+        "training_data_sha256": training_data_sha256,
+        "sklearn_version": sklearn.__version__,
+        "created_at": time.time(),
+        **(extra or {}),
+    }
+    manifest_path = manifest_path_for(model_path)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    return StoredArtifact(sha256, store_path, model_path, manifest_path, manifest)
+
+
+class _PyfuncPipeline:
+    """pyfunc wrapper around a stored pipeline (predict + get_raw_model)."""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def predict(self, model_input, params=None):
+        return self.pipeline.predict(model_input)
+
+    def get_raw_model(self):
+        return self.pipeline
+
+
+def _load_pyfunc(path: str) -> _PyfuncPipeline:
+    """MLflow pyfunc loader for models logged by `log_to_mlflow`: `path` is the stored file."""
+    return _PyfuncPipeline(joblib.load(path))
+
+
+def log_to_mlflow(artifact: StoredArtifact, artifact_path: str = "model") -> None:
+    """
+    Log the already-serialized file as an MLflow model, plus its manifest.
+
+    The stored file is uploaded as-is (no second pickling) under a pyfunc
+    flavor whose loader is `_load_pyfunc`, so runs:/<id>/<artifact_path>
+    works with mlflow.pyfunc.load_model, the model registry and
+    `mlflow models serve`. There is no sklearn flavor (it expects a plain
+    pickle): use mlflow.pyfunc.load_model(...).get_raw_model() or
+    joblib.load on the downloaded file instead of mlflow.sklearn.load_model.
+    """
+    mlflow.set_tag("model_sha256", artifact.sha256)
+    # MLflow 3 names logged models; 2.x (still allowed by requirements.txt) takes artifact_path
+    if int(mlflow.__version__.split(".")[0]) >= 3:
+        location = {"name": artifact_path}
+    else:
+        location = {"artifact_path": artifact_path}
+    mlflow.pyfunc.log_model(
+        **location,
+        loader_module="maternal_risk.models.artifact_store",
+        data_path=str(artifact.store_path),
+        code_paths=[str(Path(__file__).resolve().parents[1])],  # the maternal_risk package
+    )
+    mlflow.log_artifact(str(artifact.manifest_path), artifact_path=artifact_path)
@@ -4,10 +4,10 @@ import argparse
 import json
 from pathlib import Path
 
-import joblib
 import pandas as pd
 import yaml
 import matplotlib.pyplot as plt
+from joblib import Parallel, delayed
 
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
@@ -17,8 +17,11 @@ from maternal_risk.data.load_data import load_data
 from maternal_risk.data.validate import validate_schema
 from maternal_risk.features.build_features import add_features
 from maternal_risk.models.registry import get_model_specs
+from maternal_risk.models.artifact_store import file_sha256, save_pipeline
+from maternal_risk.models.resources import budget_from_config
 from maternal_risk.evaluation.metrics import evaluate_classification
 from maternal_risk.evaluation.plots import save_confusion_matrix
+from maternal_risk.evaluation.profiling import StageProfiler
 
 LABELS = ["low risk", "mid risk", "high risk"]
 
@@ -31,6 +34,68 @@ def build_pipeline(needs_scaling: bool, estimator: object) -> Pipeline:
     return Pipeline(steps)
 
 
+def _train_and_evaluate(
+    model_key: str,
+    spec,
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    label_encoder: LabelEncoder,
+    report_dir: Path,
+    fig_dir: Path,
+    model_dir: Path | None,
+    store_dir: Path,
+    data_sha256: str | None,
+    profiler: StageProfiler,
+) -> dict:
+    """Fit one model, write its report/confusion matrix (and model if model_dir), return metrics."""
+    pipeline = build_pipeline(spec.needs_scaling, spec.estimator)
+    with profiler.stage("fit", model_key):
+        pipeline.fit(X_train, y_train)
+
+    with profiler.stage("predict", model_key):
+        y_pred = pipeline.predict(X_test)
+
+    # Decode predictions and test labels back to string labels for evaluation
+    y_test_labels = label_encoder.inverse_transform(y_test)
+    y_pred_labels = label_encoder.inverse_transform(y_pred)
+
+    eval_result = evaluate_classification(y_test_labels, y_pred_labels, labels=LABELS)
+
+    # Save confusion matrix
+    with profiler.stage("plotting", model_key):
+        save_confusion_matrix(
+            y_test_labels,
+            y_pred_labels,
+            labels=LABELS,
+            out_path=fig_dir / f"confusion_matrix_{model_key}.png",
+        )
+
+    # Optionally save model
+    if model_dir is not None:
+        with profiler.stage("save_model", model_key):
+            save_pipeline(
+                pipeline,
+                model_dir / f"{model_key}.joblib",
+                store_dir,
+                label_names=list(label_encoder.inverse_transform(pipeline.classes_)),
+                training_data_sha256=data_sha256,
+                extra={"model_key": model_key},
+            )
+
+    # Save report text per model
+    (report_dir / f"classification_report_{model_key}.txt").write_text(
+        eval_result.classification_report_text
+    )
+
+    return {
+        "model_key": model_key,
+        "model_name": spec.name,
+        **eval_result.metrics,
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
@@ -39,26 +104,50 @@ def main() -> None:
         action="store_true",
         help="If set, saves each trained model into /models (can be slower).",
     )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Models trained in parallel (default: resources.outer_jobs in the config).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time and peak memory per stage (reports/profile_comparison.json).",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="With --profile, also dump cProfile stats per stage to reports/profile/.",
+    )
     args = parser.parse_args()
 
     cfg = yaml.safe_load(Path(args.config).read_text())
+    budget = budget_from_config(cfg, outer_jobs=args.n_jobs)
 
     raw_path = cfg["data"]["raw_path"]
     test_size = float(cfg["train"]["test_size"])
     random_state = int(cfg["train"]["random_state"])
     model_dir = Path(cfg["output"]["model_dir"])
     report_dir = Path(cfg["output"]["report_dir"])
+    store_dir = Path(cfg["output"].get("store_dir", model_dir / "store"))
+    profile_enabled = args.profile or args.cprofile
+    cprofile_dir = report_dir / "profile" if args.cprofile else None
+    profiler = StageProfiler(enabled=profile_enabled, cprofile_dir=cprofile_dir)
 
     # Load
-    df = load_data(raw_path)
+    with profiler.stage("load_data"):
+        df = load_data(raw_path)
 
     # Validate
-    result = validate_schema(df)
+    with profiler.stage("validate_schema"):
+        result = validate_schema(df)
     if not result.ok:
         raise ValueError(f"Data validation failed: {result.errors}")
 
     # Feature engineering
-    df = add_features(df)
+    with profiler.stage("add_features"):
+        df = add_features(df)
 
     # Prepare X/y
     df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
@@ -75,55 +164,53 @@ def main() -> None:
         X, y_encoded, test_size=test_size, random_state=random_state, stratify=y_encoded
     )
 
-    specs = get_model_specs(random_state=random_state)
+    specs = get_model_specs(random_state=random_state, n_jobs=budget.inner_threads)
 
     # Output dirs
     report_dir.mkdir(parents=True, exist_ok=True)
     fig_dir = report_dir / "figures"
     fig_dir.mkdir(parents=True, exist_ok=True)
+    data_sha256 = None
     if args.save_models:
         model_dir.mkdir(parents=True, exist_ok=True)
+        data_sha256 = file_sha256(raw_path)
 
-    rows: list[dict] = []
-
-    for model_key, spec in specs.items():
+    def run_one(model_key: str, spec) -> tuple[dict, list]:
         print(f"\n=== Training: {model_key} ({spec.name}) ===")
-
-        pipeline = build_pipeline(spec.needs_scaling, spec.estimator)
-        pipeline.fit(X_train, y_train)
-
-        y_pred = pipeline.predict(X_test)
-
-        # Decode predictions and test labels back to string labels for evaluation
-        y_test_labels = label_encoder.inverse_transform(y_test)
-        y_pred_labels = label_encoder.inverse_transform(y_pred)
-
-        eval_result = evaluate_classification(y_test_labels, y_pred_labels, labels=LABELS)
-
-        # Save confusion matrix
-        save_confusion_matrix(
-            y_test_labels,
-            y_pred_labels,
-            labels=LABELS,
-            out_path=fig_dir / f"confusion_matrix_{model_key}.png",
-        )
-
-        # Optionally save model
-        if args.save_models:
-            joblib.dump(pipeline, model_dir / f"{model_key}.joblib")
-
-        row = {
-            "model_key": model_key,
-            "model_name": spec.name,
-            **eval_result.metrics,
-        }
+        # One profiler per model: in worker processes the timings travel back
+        # with the result instead of being recorded on a pickled copy
+        model_profiler = StageProfiler(enabled=profile_enabled, cprofile_dir=cprofile_dir)
+        with budget.limits():
+            row = _train_and_evaluate(
+                model_key,
+                spec,
+                X_train,
+                y_train,
+                X_test,
+                y_test,
+                label_encoder,
+                report_dir,
+                fig_dir,
+                model_dir if args.save_models else None,
+                store_dir,
+                data_sha256,
+                model_profiler,
+            )
+        return row, model_profiler.timings
+
+    # Models train side by side in worker processes; each is capped at
+    # inner_threads so the whole run stays within the CPU budget
+    print(
+        f"Training {len(specs)} models: {budget.outer_jobs} at a time, "
+        f"{budget.inner_threads} thread(s) each."
+    )
+    results = Parallel(n_jobs=budget.outer_jobs)(
+        delayed(run_one)(model_key, spec) for model_key, spec in specs.items()
+    )
+    rows = []
+    for row, timings in results:
         rows.append(row)
-
-        # Save report text per model
-        (report_dir / f"classification_report_{model_key}.txt").write_text(
-            eval_result.classification_report_text
-        )
-
+        profiler.timings.extend(timings)
         print(json.dumps(row, indent=2))
 
     results_df = pd.DataFrame(rows).sort_values("f1_macro", ascending=False)
@@ -135,17 +222,27 @@ def main() -> None:
     )
 
     # Plot macro F1
-    plt.figure()
-    results_df.plot(x="model_key", y="f1_macro", kind="bar", legend=False)
-    plt.title("Model Comparison (Macro F1)")
-    plt.ylabel("f1_macro")
-    plt.tight_layout()
-    plt.savefig(fig_dir / "model_f1_macro.png", dpi=150)
-    plt.close()
+    with profiler.stage("plotting"):
+        plt.figure()
+        results_df.plot(x="model_key", y="f1_macro", kind="bar", legend=False)
+        plt.title("Model Comparison (Macro F1)")
+        plt.ylabel("f1_macro")
+        plt.tight_layout()
+        plt.savefig(fig_dir / "model_f1_macro.png", dpi=150)
+        plt.close()
 
     print("\nSaved:")
     print(f"- {report_dir / 'model_comparison.csv'}")
     print(f"- {fig_dir / 'model_f1_macro.png'}")
+    if profiler.enabled:
+        # Per-model stages ran `outer_jobs` at a time, so their wall times overlap
+        timing_path = profiler.save(
+            report_dir / "profile_comparison.json",
+            command="compare",
+            outer_jobs=budget.outer_jobs,
+            inner_threads=budget.inner_threads,
+        )
+        print(f"- {timing_path}")
     print("\nTop models:")
     print(results_df[["model_key", "f1_macro", "accuracy"]].head(5))
 
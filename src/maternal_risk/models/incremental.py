@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+import mlflow  # >>> MLflow
+from maternal_risk.data.load_data import load_data
+from maternal_risk.data.validate import validate_schema
+from maternal_risk.evaluation.metrics import evaluate_classification
+from maternal_risk.features.build_features import add_features
+from maternal_risk.models.artifact_store import file_sha256, log_to_mlflow, save_pipeline
+from maternal_risk.models.resources import budget_from_config, set_n_jobs
+from maternal_risk.models.train import LABELS, build_pipeline
+
+# Labelled CSVs only: a live prediction log changes while it is hashed, and its
+# served labels must never become training targets
+PARTITION_PATTERNS = ("*.csv",)
+
+
+def load_state(state_path: Path) -> dict:
+    if state_path.exists():
+        return json.loads(state_path.read_text())
+    return {"partitions": {}, "models": {}}
+
+
+def save_state(state: dict, state_path: Path) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, indent=2))
+
+
+def discover_partitions(raw_path: str | Path, partitions_dir: str | Path) -> list[Path]:
+    """The base CSV followed by every partition file, oldest name first."""
+    paths = [Path(raw_path)] if Path(raw_path).exists() else []
+    partitions_dir = Path(partitions_dir)
+    if partitions_dir.is_dir():
+        found = {p for pattern in PARTITION_PATTERNS for p in partitions_dir.glob(pattern)}
+        paths.extend(sorted(found))
+    return paths
+
+
+def prepare_partition(path: Path) -> pd.DataFrame:
+    """Load, validate and featurize one partition (same steps as train.py)."""
+    df = load_data(path)
+
+    result = validate_schema(df)
+    if not result.ok:
+        raise ValueError(f"Data validation failed for {path}: {result.errors}")
+
+    df = add_features(df)
+    df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
+    return df
+
+
+def refresh_partitions(
+    raw_path: str | Path, partitions_dir: str | Path, processed_dir: Path, state: dict
+) -> list[str]:
+    """
+    Process only partitions that are new or changed since the last run
+    (the watermark is the content hash recorded per partition in `state`).
+    Returns the names of the partitions that were (re)processed.
+    """
+    new = []
+    for path in discover_partitions(raw_path, partitions_dir):
+        digest = file_sha256(path)
+        seen = state["partitions"].get(path.name)
+        if seen and seen["sha256"] == digest and Path(seen["processed_path"]).exists():
+            continue
+
+        df = prepare_partition(path)
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        processed_path = processed_dir / f"{path.stem}.parquet"
+        df.to_parquet(processed_path, index=False)
+
+        state["partitions"][path.name] = {
+            "source_path": str(path),
+            "sha256": digest,
+            "rows": len(df),
+            "processed_path": str(processed_path),
+            "processed_at": time.time(),
+        }
+        new.append(path.name)
+    return new
+
+
+def _read_partitions(state: dict, names) -> pd.DataFrame:
+    frames = [pd.read_parquet(state["partitions"][n]["processed_path"]) for n in names]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _split(X, y, test_size: float, random_state: int):
+    try:
+        return train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y
+        )
+    except ValueError:
+        # Small partitions may not have enough rows per class to stratify
+        return train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+
+def warm_update(pipeline, model_key: str, X_all, y_all, X_new, y_new, inc_cfg: dict) -> str:
+    """
+    Update a previously fitted pipeline in place with as little work as possible.
+
+    - rf / extratrees: grow `extra_estimators` more trees (warm_start)
+    - xgboost: `extra_rounds` more boosting rounds on top of the existing booster
+    - mlp: `partial_fit_epochs` passes over the new rows (scaler stays frozen)
+    - anything else: refit from scratch (cheap models)
+
+    Returns the update mode used.
+    """
+    model = pipeline.named_steps["model"]
+
+    if model_key in ("rf", "extratrees"):
+        extra = int(inc_cfg.get("extra_estimators", 100))
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + extra)
+        pipeline.fit(X_all, y_all)
+        return "warm_start"
+
+    if model_key == "xgboost":
+        extra = int(inc_cfg.get("extra_rounds", 100))
+        booster = model.get_booster()
+        continued = clone(model).set_params(n_estimators=extra)
+        continued.fit(X_all, y_all, xgb_model=booster)
+        pipeline.steps[-1] = ("model", continued)
+        return "continued_boosting"
+
+    if model_key == "mlp":
+        X_scaled = pipeline[:-1].transform(X_new) if len(pipeline) > 1 else X_new
+        for _ in range(int(inc_cfg.get("partial_fit_epochs", 20))):
+            model.partial_fit(X_scaled, y_new)
+        return "partial_fit"
+
+    pipeline.fit(X_all, y_all)
+    return "refit"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
+    parser.add_argument(
+        "--model", type=str, required=True, help="Model key (e.g., logreg, rf, xgboost)"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Ignore the previous model and retrain from scratch."
+    )
+    parser.add_argument(
+        "--compare-full",
+        action="store_true",
+        help="Also time a full retrain on the same data (instead of estimating it).",
+    )
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(Path(args.config).read_text())
+    inc_cfg = cfg["incremental"]
+
+    raw_path = cfg["data"]["raw_path"]
+    test_size = float(cfg["train"]["test_size"])
+    random_state = int(cfg["train"]["random_state"])
+    budget = budget_from_config(cfg)
+    model_dir = Path(cfg["output"]["model_dir"])
+    store_dir = Path(cfg["output"].get("store_dir", model_dir / "store"))
+    processed_dir = Path(inc_cfg["processed_dir"])
+    state_path = Path(inc_cfg["state_path"])
+
+    state = load_state(state_path)
+    previous = state["models"].get(args.model)
+    seen_by_model = set(previous["partitions"]) if previous else set()
+
+    # 1) Validate + featurize only new/changed partitions
+    start = time.perf_counter()
+    refreshed = refresh_partitions(raw_path, inc_cfg["partitions_dir"], processed_dir, state)
+    prep_seconds = time.perf_counter() - start
+    save_state(state, state_path)
+
+    all_names = list(state["partitions"])
+    new_names = [n for n in all_names if n not in seen_by_model or n in refreshed]
+    full = args.full or previous is None or not Path(previous["artifact"]).exists()
+
+    if not new_names and not full:
+        print(f"No new partitions since v{previous['version']} of '{args.model}'. Nothing to do.")
+        return
+
+    # 2) Prepare X/y from the processed partitions
+    label_encoder = LabelEncoder()
+    label_encoder.fit(LABELS)  # Fit on defined order: low, mid, high
+
+    if full:
+        new_names = all_names
+    old_df = _read_partitions(state, [n for n in all_names if n not in new_names])
+    new_df = _read_partitions(state, new_names)
+
+    X_new = new_df.drop(columns=["RiskLevel"])
+    y_new = label_encoder.transform(new_df["RiskLevel"])
+
+    # Evaluate on held-out rows of the new data only (older rows were trained on)
+    X_new_train, X_test, y_new_train, y_test = _split(X_new, y_new, test_size, random_state)
+
+    if old_df.empty:
+        X_all, y_all = X_new_train, y_new_train
+    else:
+        X_all = pd.concat([old_df.drop(columns=["RiskLevel"]), X_new_train], ignore_index=True)
+        y_all = np.concatenate([label_encoder.transform(old_df["RiskLevel"]), y_new_train])
+
+    # 3) Fit: warm update of the previous artifact, or full retrain
+    start = time.perf_counter()
+    with budget.limits():
+        if full:
+            pipeline = build_pipeline(
+                args.model, random_state=random_state, n_jobs=budget.inner_threads
+            )
+            pipeline.fit(X_all, y_all)
+            mode = "full"
+        else:
+            pipeline = joblib.load(previous["artifact"])
+            set_n_jobs(pipeline, budget.inner_threads)
+            mode = warm_update(
+                pipeline, args.model, X_all, y_all, X_new_train, y_new_train, inc_cfg
+            )
+    fit_seconds = time.perf_counter() - start
+
+    # 4) What a full retrain would have cost (measured, or extrapolated per row)
+    total_rows = int(sum(state["partitions"][n]["rows"] for n in all_names))
+    rate = previous.get("full_rate_per_row") if previous else None
+    measured = full or args.compare_full or rate is None
+    if full:
+        refreshed_rows = sum(state["partitions"][n]["rows"] for n in refreshed)
+        prep_rate = (rate or {}).get("prep", 0.0)
+        if refreshed_rows:
+            prep_rate = prep_seconds / refreshed_rows
+        full_seconds = prep_rate * total_rows + fit_seconds
+        rate = {"prep": prep_rate, "fit": fit_seconds / len(X_all)}
+    elif measured:
+        start = time.perf_counter()
+        for name in all_names:
+            prepare_partition(Path(state["partitions"][name]["source_path"]))
+        with budget.limits():
+            build_pipeline(
+                args.model, random_state=random_state, n_jobs=budget.inner_threads
+            ).fit(X_all, y_all)
+        full_seconds = time.perf_counter() - start
+    else:
+        full_seconds = rate["prep"] * total_rows + rate["fit"] * len(X_all)
+    incremental_seconds = prep_seconds + fit_seconds
+    seconds_saved = full_seconds - incremental_seconds
+
+    # 5) Evaluate
+    y_pred = pipeline.predict(X_test)
+    y_test_labels = label_encoder.inverse_transform(y_test)
+    y_pred_labels = label_encoder.inverse_transform(y_pred)
+    eval_result = evaluate_classification(y_test_labels, y_pred_labels, labels=LABELS)
+
+    # 6) Versioned artifact + watermark
+    version = (previous["version"] + 1) if previous else 1
+    # Training data identity: the content hashes of every partition, in order
+    data_sha256 = hashlib.sha256(
+        "".join(state["partitions"][n]["sha256"] for n in all_names).encode()
+    ).hexdigest()
+    artifact = save_pipeline(
+        pipeline,
+        model_dir / f"{args.model}_v{version}.joblib",
+        store_dir,
+        label_names=list(label_encoder.inverse_transform(pipeline.classes_)),
+        training_data_sha256=data_sha256,
+        extra={"model_key": args.model, "version": version, "update_mode": mode},
+    )
+    model_path = artifact.model_path
+
+    state["models"][args.model] = {
+        "version": version,
+        "artifact": str(model_path),
+        "partitions": all_names,
+        "rows_seen": total_rows,
+        "mode": mode,
+        "full_rate_per_row": rate,
+        "trained_at": time.time(),
+    }
+    save_state(state, state_path)
+
+    # >>> MLflow: one run per incremental update
+    mlflow.set_tracking_uri("http://127.0.0.1:5000")
+    mlflow.set_experiment("maternal_risk")
+
+    with mlflow.start_run(run_name=f"{args.model}-v{version}"):
+        mlflow.log_param("model_key", args.model)
+        mlflow.log_param("version", version)
+        mlflow.log_param("update_mode", mode)
+        mlflow.log_param("new_partitions", ",".join(new_names))
+        mlflow.log_param("test_size", test_size)
+        mlflow.log_param("random_state", random_state)
+
+        for k, v in eval_result.metrics.items():
+            if isinstance(v, (int, float)):
+                mlflow.log_metric(k, float(v))
+        mlflow.log_metric("new_rows", len(new_df))
+        mlflow.log_metric("total_rows", total_rows)
+        mlflow.log_metric("prep_seconds", prep_seconds)
+        mlflow.log_metric("fit_seconds", fit_seconds)
+        mlflow.log_metric("full_retrain_seconds", full_seconds)
+        mlflow.log_metric("seconds_saved", seconds_saved)
+
+        log_to_mlflow(artifact, artifact_path="model")
+
+    print(f"\nModel v{version} ({mode}) saved to: {model_path}")
+    print(f"New partitions: {new_names or '-'} ({len(new_df)} rows of {total_rows})")
+    print(
+        f"Incremental: {incremental_seconds:.2f}s "
+        f"(prep {prep_seconds:.2f}s, fit {fit_seconds:.2f}s)"
+    )
+    how = "measured" if measured else "estimated"
+    print(f"Full retrain ({how}): {full_seconds:.2f}s -> saved {seconds_saved:.2f}s")
+    print("\nMetrics (held-out new rows):")
+    print(json.dumps(eval_result.metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
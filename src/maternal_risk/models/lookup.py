@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import yaml
+
+from maternal_risk.data.load_data import load_data
+from maternal_risk.features.build_features import FEATURE_COLUMNS, add_features
+from maternal_risk.models.artifact_store import file_sha256
+
+
+def grid_axes(axes_cfg: dict) -> list[dict]:
+    """
+    Turn the `lookup.axes` config ({name: [start, stop, step]}) into axis specs.
+
+    The axis order always follows FEATURE_COLUMNS so the table layout does not
+    depend on the order of keys in the YAML file.
+    """
+    missing = [c for c in FEATURE_COLUMNS if c not in axes_cfg]
+    if missing:
+        raise ValueError(f"Lookup axes missing for: {missing}")
+
+    axes = []
+    for name in FEATURE_COLUMNS:
+        start, stop, step = (float(v) for v in axes_cfg[name])
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid lookup axis for '{name}': {axes_cfg[name]}")
+        size = round((stop - start) / step) + 1
+        axes.append({"name": name, "start": start, "step": step, "size": size})
+    return axes
+
+
+def grid_indices(X: pd.DataFrame, axes: list[dict]) -> tuple[np.ndarray, ...]:
+    """Snap each row of X to its nearest grid point (clipped to the grid)."""
+    idx = []
+    for axis in axes:
+        i = np.rint((X[axis["name"]].to_numpy(dtype=float) - axis["start"]) / axis["step"])
+        idx.append(np.clip(i, 0, axis["size"] - 1).astype(np.intp))
+    return tuple(idx)
+
+
+def _grid_frame(flat: np.ndarray, axes: list[dict]) -> pd.DataFrame:
+    shape = tuple(a["size"] for a in axes)
+    coords = np.unravel_index(flat, shape)
+    data = {a["name"]: a["start"] + c * a["step"] for a, c in zip(axes, coords)}
+    return add_features(pd.DataFrame(data, columns=FEATURE_COLUMNS))
+
+
+def _check_inputs(axes: list[dict], n: int, raw_path: str | None, seed: int) -> pd.DataFrame:
+    """
+    Inputs used to measure table/model agreement: uniform draws over the grid
+    bounds plus, when available, the real training rows (the realistic traffic).
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        a["name"]: rng.uniform(a["start"], a["start"] + (a["size"] - 1) * a["step"], size=n)
+        for a in axes
+    }
+    frames = [pd.DataFrame(data, columns=FEATURE_COLUMNS)]
+
+    if raw_path and Path(raw_path).exists():
+        df = load_data(raw_path)[FEATURE_COLUMNS].astype(float)
+        in_bounds = np.ones(len(df), dtype=bool)
+        for a in axes:
+            hi = a["start"] + (a["size"] - 1) * a["step"]
+            in_bounds &= df[a["name"]].between(a["start"], hi).to_numpy()
+        frames.append(df[in_bounds])
+
+    return add_features(pd.concat(frames, ignore_index=True))
+
+
+def build_lookup_table(
+    model_path: str | Path,
+    out_dir: str | Path,
+    axes_cfg: dict,
+    agreement_threshold: float = 0.95,
+    n_check: int = 20000,
+    chunk_size: int = 200000,
+    raw_path: str | None = None,
+    random_state: int = 42,
+) -> dict:
+    """
+    Evaluate a trained pipeline on every point of a quantized input grid.
+
+    Writes to `out_dir`:
+    - labels.npy : uint8 class index per grid cell
+    - proba.npy  : uint8 class probabilities per grid cell (p * 255)
+    - meta.json  : axes, classes, source model hash and measured agreement
+
+    Both arrays are plain .npy so the web app can memory-map them. Probabilities
+    are quantized to uint8, which keeps the table ~4x smaller than float32.
+
+    The build fails (and removes `out_dir`) if the table agrees with the real
+    model on fewer than `agreement_threshold` of the check inputs.
+    """
+    model_path = Path(model_path)
+    out_dir = Path(out_dir)
+    model = joblib.load(model_path)
+
+    axes = grid_axes(axes_cfg)
+    shape = tuple(a["size"] for a in axes)
+    n_cells = int(np.prod(shape))
+    classes = list(model.classes_)
+    if len(classes) > 255:
+        raise ValueError("Lookup table supports at most 255 classes.")
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    labels = np.lib.format.open_memmap(
+        out_dir / "labels.npy", mode="w+", dtype=np.uint8, shape=shape
+    )
+    proba = np.lib.format.open_memmap(
+        out_dir / "proba.npy", mode="w+", dtype=np.uint8, shape=(*shape, len(classes))
+    )
+    flat_labels = labels.reshape(-1)
+    flat_proba = proba.reshape(-1, len(classes))
+
+    print(f"Evaluating {n_cells:,} grid cells {shape} in chunks of {chunk_size:,} ...")
+    for lo in range(0, n_cells, chunk_size):
+        hi = min(lo + chunk_size, n_cells)
+        p = model.predict_proba(_grid_frame(np.arange(lo, hi), axes))
+        flat_labels[lo:hi] = np.argmax(p, axis=1)
+        flat_proba[lo:hi] = np.rint(p * 255)
+    labels.flush()
+    proba.flush()
+
+    # Agreement: real model vs. nearest-grid-point answer
+    X_check = _check_inputs(axes, n_check, raw_path, random_state)
+    expected = np.asarray(model.predict(X_check))
+    looked_up = np.asarray(classes, dtype=object)[labels[grid_indices(X_check, axes)]]
+    agreement = float(np.mean(expected.astype(str) == looked_up.astype(str)))
+    del labels, proba, flat_labels, flat_proba
+
+    if agreement < agreement_threshold:
+        shutil.rmtree(out_dir)
+        raise ValueError(
+            f"Lookup table agreement {agreement:.4f} is below the threshold "
+            f"{agreement_threshold:.4f}. Use finer lookup.axes steps."
+        )
+
+    meta = {
+        "axes": axes,
+        "classes": [c.item() if hasattr(c, "item") else c for c in classes],
+        "model_path": str(model_path),
+        "model_sha256": file_sha256(model_path),
+        "n_cells": n_cells,
+        "agreement": agreement,
+        "n_check": len(X_check),
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+    return meta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, required=True, help="Path to configs/train.yaml")
+    parser.add_argument(
+        "--model-path", type=str, required=True, help="Trained pipeline (e.g., models/rf.joblib)"
+    )
+    parser.add_argument(
+        "--out", type=str, default=None, help="Output dir (default: <model-path>_lookup)"
+    )
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(Path(args.config).read_text())
+    lookup_cfg = cfg["lookup"]
+
+    model_path = Path(args.model_path)
+    out_dir = Path(args.out) if args.out else model_path.with_name(f"{model_path.stem}_lookup")
+
+    meta = build_lookup_table(
+        model_path,
+        out_dir,
+        lookup_cfg["axes"],
+        agreement_threshold=float(lookup_cfg.get("agreement_threshold", 0.95)),
+        n_check=int(lookup_cfg.get("n_check", 20000)),
+        chunk_size=int(lookup_cfg.get("chunk_size", 200000)),
+        raw_path=cfg["data"]["raw_path"],
+        random_state=int(cfg["train"]["random_state"]),
+    )
+
+    print(f"\nLookup table saved to: {out_dir}")
+    print(f"Agreement with model: {meta['agreement']:.4f} on {meta['n_check']} inputs")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,10 +23,13 @@ class ModelSpec:
     estimator: object
 
 
-def get_model_specs(random_state: int = 42) -> dict[str, ModelSpec]:
+def get_model_specs(random_state: int = 42, n_jobs: int | None = None) -> dict[str, ModelSpec]:
     """
     Returns a dictionary mapping model key -> ModelSpec
     This powers the model selection.
+
+    n_jobs is the thread count for estimators with their own thread pool
+    (forests, XGBoost); see maternal_risk.models.resources.
     """
     specs: dict[str, ModelSpec] = {}
 
@@ -56,6 +59,7 @@ def get_model_specs(random_state: int = 42) -> dict[str, ModelSpec]:
             n_estimators=300,
             random_state=random_state,
             class_weight="balanced",
+            n_jobs=n_jobs,
         ),
     )
 
@@ -67,6 +71,7 @@ def get_model_specs(random_state: int = 42) -> dict[str, ModelSpec]:
             n_estimators=500,
             random_state=random_state,
             class_weight="balanced",
+            n_jobs=n_jobs,
         ),
     )
 
@@ -100,6 +105,7 @@ def get_model_specs(random_state: int = 42) -> dict[str, ModelSpec]:
                 objective="multi:softprob",
                 eval_metric="mlogloss",
                 random_state=random_state,
+                n_jobs=n_jobs,
             ),
         )
 
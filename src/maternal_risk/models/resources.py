@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from threadpoolctl import threadpool_limits
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity / container cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class ThreadBudget:
+    """
+    Splits a CPU budget between outer parallelism (models trained side by side)
+    and inner parallelism (each estimator's n_jobs and its OpenMP/BLAS pools),
+    so outer_jobs x inner_threads never exceeds the number of cores.
+    """
+
+    cpus: int
+    outer_jobs: int
+
+    @property
+    def inner_threads(self) -> int:
+        return max(1, self.cpus // self.outer_jobs)
+
+    def limits(self):
+        """Context manager capping OpenMP/BLAS pools at `inner_threads`."""
+        return threadpool_limits(limits=self.inner_threads)
+
+
+def budget_from_config(cfg: dict, outer_jobs: int | None = None) -> ThreadBudget:
+    """
+    Build the budget from the `resources` section of configs/train.yaml.
+
+    resources.cpus: cores to use (null = all available)
+    resources.outer_jobs: models trained in parallel (overridden by `outer_jobs`)
+    """
+    res = cfg.get("resources") or {}
+    cpus = int(res.get("cpus") or available_cpus())
+    outer = int(outer_jobs or res.get("outer_jobs") or 1)
+    return ThreadBudget(cpus=cpus, outer_jobs=max(1, min(outer, cpus)))
+
+
+def set_n_jobs(model, n_jobs: int) -> None:
+    """
+    Set n_jobs on every step of a (possibly pipelined) fitted model, e.g. one
+    loaded from disk that was trained with a different budget.
+    """
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    for step in steps:
+        # LogisticRegression ignores n_jobs since scikit-learn 1.8 and warns if it is set
+        if type(step).__name__ == "LogisticRegression":
+            continue
+        if "n_jobs" in step.get_params(deep=False):
+            step.set_params(n_jobs=n_jobs)
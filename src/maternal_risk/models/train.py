@@ -4,27 +4,29 @@ import argparse
 import json
 from pathlib import Path
 
-import joblib
 import yaml
 import mlflow  # >>> MLflow
-import mlflow.sklearn  # >>> MLflow
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 
 from maternal_risk.data.load_data import load_data
+from maternal_risk.data.profile import build_reference_profile, save_reference_profile
 from maternal_risk.data.validate import validate_schema
 from maternal_risk.features.build_features import add_features
 from maternal_risk.models.registry import get_model_specs
+from maternal_risk.models.resources import budget_from_config
+from maternal_risk.models.artifact_store import file_sha256, log_to_mlflow, save_pipeline
 from maternal_risk.evaluation.metrics import evaluate_classification
 from maternal_risk.evaluation.plots import save_confusion_matrix
+from maternal_risk.evaluation.profiling import StageProfiler
 
 
 LABELS = ["low risk", "mid risk", "high risk"]
 
 
-def build_pipeline(model_key: str, random_state: int) -> Pipeline:
-    specs = get_model_specs(random_state=random_state)
+def build_pipeline(model_key: str, random_state: int, n_jobs: int | None = None) -> Pipeline:
+    specs = get_model_specs(random_state=random_state, n_jobs=n_jobs)
 
     if model_key not in specs:
         available = ", ".join(specs.keys())
@@ -46,6 +48,16 @@ def main() -> None:
     parser.add_argument(
         "--model", type=str, required=True, help="Model key (e.g., logreg, rf, svm)"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time and peak memory per stage (reports/profile_<model>.json).",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="With --profile, also dump cProfile stats per stage to reports/profile/.",
+    )
     args = parser.parse_args()
 
     cfg = yaml.safe_load(Path(args.config).read_text())
@@ -53,8 +65,14 @@ def main() -> None:
     raw_path = cfg["data"]["raw_path"]
     test_size = float(cfg["train"]["test_size"])
     random_state = int(cfg["train"]["random_state"])
+    budget = budget_from_config(cfg)
     model_dir = Path(cfg["output"]["model_dir"])
     report_dir = Path(cfg["output"]["report_dir"])
+    store_dir = Path(cfg["output"].get("store_dir", model_dir / "store"))
+    profiler = StageProfiler(
+        enabled=args.profile or args.cprofile,
+        cprofile_dir=report_dir / "profile" if args.cprofile else None,
+    )
 
     # >>> MLflow: tell this script where MLflow is running + choose experiment name
     mlflow.set_tracking_uri("http://127.0.0.1:5000")
@@ -74,6 +92,7 @@ def main() -> None:
         mlflow.log_param("test_size", test_size)
         mlflow.log_param("random_state", random_state)
         mlflow.log_param("needs_scaling", spec.needs_scaling)
+        mlflow.log_param("threads", budget.inner_threads)
 
         # If your registry exposes hyperparams as a dict, log them too (optional-safe)
         # This won't crash if it's not available.
@@ -81,15 +100,18 @@ def main() -> None:
             mlflow.log_params(spec.params)
 
         # 1) Load
-        df = load_data(raw_path)
+        with profiler.stage("load_data", args.model):
+            df = load_data(raw_path)
 
         # 2) Validate
-        result = validate_schema(df)
+        with profiler.stage("validate_schema", args.model):
+            result = validate_schema(df)
         if not result.ok:
             raise ValueError(f"Data validation failed: {result.errors}")
 
         # 3) Feature engineering
-        df = add_features(df)
+        with profiler.stage("add_features", args.model):
+            df = add_features(df)
 
         # 4) Prepare X/y
         df["RiskLevel"] = df["RiskLevel"].astype(str).str.strip().str.lower()
@@ -107,11 +129,15 @@ def main() -> None:
         )
 
         # 6) Train
-        pipeline = build_pipeline(args.model, random_state=random_state)
-        pipeline.fit(X_train, y_train)
+        pipeline = build_pipeline(
+            args.model, random_state=random_state, n_jobs=budget.inner_threads
+        )
+        with profiler.stage("fit", args.model), budget.limits():
+            pipeline.fit(X_train, y_train)
 
         # 7) Predict + evaluate
-        y_pred = pipeline.predict(X_test)
+        with profiler.stage("predict", args.model):
+            y_pred = pipeline.predict(X_test)
 
         # Decode predictions and test labels back to string labels for evaluation
         y_test_labels = label_encoder.inverse_transform(y_test)
@@ -131,8 +157,21 @@ def main() -> None:
         report_dir.mkdir(parents=True, exist_ok=True)
         (report_dir / "figures").mkdir(parents=True, exist_ok=True)
 
-        model_path = model_dir / f"{args.model}.joblib"
-        joblib.dump(pipeline, model_path)
+        # Serialized once, stored by content hash; models/<key>.joblib links to it
+        with profiler.stage("save_model", args.model):
+            artifact = save_pipeline(
+                pipeline,
+                model_dir / f"{args.model}.joblib",
+                store_dir,
+                label_names=list(label_encoder.inverse_transform(pipeline.classes_)),
+                training_data_sha256=file_sha256(raw_path),
+                extra={"model_key": args.model},
+            )
+        model_path = artifact.model_path
+
+        # Reference input profile for the web app's drift monitor
+        profile = build_reference_profile(X_train, label_encoder.inverse_transform(y_train))
+        profile_path = save_reference_profile(profile, model_dir / f"{args.model}.profile.json")
 
         metrics_path = report_dir / f"metrics_{args.model}.json"
         metrics_path.write_text(json.dumps(eval_result.metrics, indent=2))
@@ -141,23 +180,36 @@ def main() -> None:
         report_path.write_text(eval_result.classification_report_text)
 
         cm_path = report_dir / "figures" / f"confusion_matrix_{args.model}.png"
-        save_confusion_matrix(
-            y_test_labels,
-            y_pred_labels,
-            labels=LABELS,
-            out_path=cm_path,
-        )
+        with profiler.stage("plotting", args.model):
+            save_confusion_matrix(
+                y_test_labels,
+                y_pred_labels,
+                labels=LABELS,
+                out_path=cm_path,
+            )
 
         # >>> MLflow: log artifacts + model
-        mlflow.log_artifact(str(metrics_path), artifact_path="eval")
-        mlflow.log_artifact(str(report_path), artifact_path="eval")
-        mlflow.log_artifact(str(cm_path), artifact_path="eval")
-
-        # Log the sklearn pipeline model in MLflow format
-        mlflow.sklearn.log_model(pipeline, artifact_path="model")
-
-        print(f"\nModel saved to: {model_path}")
+        with profiler.stage("mlflow_upload", args.model):
+            mlflow.log_artifact(str(metrics_path), artifact_path="eval")
+            mlflow.log_artifact(str(report_path), artifact_path="eval")
+            mlflow.log_artifact(str(cm_path), artifact_path="eval")
+            mlflow.log_artifact(str(profile_path), artifact_path="profile")
+
+            # Log the stored pipeline file + manifest (no second serialization)
+            log_to_mlflow(artifact, artifact_path="model")
+
+        # >>> MLflow: stage timings as metrics (stage_fit_wall_seconds, ...)
+        if profiler.enabled:
+            timing_path = profiler.save(
+                report_dir / f"profile_{args.model}.json", command="train", model_key=args.model
+            )
+            profiler.log_to_mlflow()
+            mlflow.log_artifact(str(timing_path), artifact_path="eval")
+            print(f"Timing report saved to: {timing_path}")
+
+        print(f"\nModel saved to: {model_path} (sha256 {artifact.sha256[:12]})")
         print(f"Metrics saved to: {metrics_path}")
+        print(f"Reference profile saved to: {profile_path}")
         print("\nMetrics:")
         print(json.dumps(eval_result.metrics, indent=2))
         print("\nClassification Report:")
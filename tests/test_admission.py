@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from webapp.admission import AdmissionController
+
+
+def test_requests_beyond_queue_are_shed_with_retry_after():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait=0.2)
+        await controller.acquire()  # takes the only slot
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await controller.acquire()
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "1"
+
+        controller.release(0.01)  # hands the slot to the queued request
+        await queued
+        assert controller.stats()["active"] == 1
+        assert controller.stats()["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiting_past_deadline_is_rejected():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait=0.05)
+        await controller.acquire()
+        with pytest.raises(HTTPException, match="timed out"):
+            await controller.acquire()
+        assert controller.waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_expected_wait_rejects_without_queueing():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait=0.5)
+        controller.service_time = 2.0  # each request takes ~2s
+        await controller.acquire()
+        with pytest.raises(HTTPException, match="expected wait"):
+            await controller.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_simultaneous_burst_respects_queue_bound():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=2, max_wait=5.0)
+        tasks = [asyncio.create_task(controller.acquire()) for _ in range(6)]
+        await asyncio.sleep(0.01)
+
+        # 1 runs, 2 queue, 3 fail fast (not after max_wait)
+        rejected = [t for t in tasks if t.done() and t.exception() is not None]
+        assert len(rejected) == 3
+        assert all("queue full" in t.exception().detail for t in rejected)
+        assert (controller.active, controller.waiting) == (1, 2)
+
+        for _ in range(3):
+            controller.release(0.01)
+            await asyncio.sleep(0)
+        await asyncio.gather(*(t for t in tasks if t not in rejected))
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
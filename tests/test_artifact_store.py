@@ -0,0 +1,69 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from maternal_risk.models.artifact_store import _load_pyfunc, save_pipeline
+from webapp.model import FEATURE_NAMES, check_manifest
+
+
+def _pipeline():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(60, len(FEATURE_NAMES))), columns=FEATURE_NAMES)
+    y = np.arange(60) % 3
+    return Pipeline([("model", LogisticRegression())]).fit(X, y)
+
+
+def test_identical_pipelines_are_stored_once(tmp_path):
+    pipeline = _pipeline()
+    labels = ["high risk", "low risk", "mid risk"]
+
+    a = save_pipeline(pipeline, tmp_path / "models" / "a.joblib", tmp_path / "store", labels)
+    b = save_pipeline(pipeline, tmp_path / "models" / "b.joblib", tmp_path / "store", labels)
+
+    assert a.sha256 == b.sha256
+    assert list((tmp_path / "store").iterdir()) == [a.store_path]
+    assert a.model_path.stat().st_ino == a.store_path.stat().st_ino  # hard link
+    assert a.manifest["feature_names"] == FEATURE_NAMES
+
+
+def test_webapp_manifest_check(tmp_path):
+    pipeline = _pipeline()
+    labels = ["high risk", "low risk", "mid risk"]
+    art = save_pipeline(pipeline, tmp_path / "rf.joblib", tmp_path / "store", labels)
+    manifest = json.loads(art.manifest_path.read_text())
+
+    model = joblib.load(art.model_path)
+    assert check_manifest(model, str(art.model_path), manifest) == {
+        0: "high risk",
+        1: "low risk",
+        2: "mid risk",
+    }
+
+    with pytest.raises(RuntimeError, match="trained on"):
+        check_manifest(model, str(art.model_path), {**manifest, "feature_names": ["Age"]})
+    with pytest.raises(RuntimeError, match="does not match its manifest"):
+        check_manifest(model, str(art.model_path), {**manifest, "sha256": "0" * 64})
+
+
+def test_stored_file_loads_as_mlflow_pyfunc(tmp_path):
+    pipeline = _pipeline()
+    stored = save_pipeline(
+        pipeline, tmp_path / "m.joblib", tmp_path / "store", ["high risk", "low risk", "mid risk"]
+    )
+
+    model = _load_pyfunc(str(stored.store_path))
+    X = pd.DataFrame(np.zeros((2, len(FEATURE_NAMES))), columns=FEATURE_NAMES)
+    assert (model.predict(X) == pipeline.predict(X)).all()
+    assert type(model.get_raw_model()) is Pipeline
+
+
+def test_label_mismatch_writes_nothing(tmp_path):
+    with pytest.raises(ValueError, match="label names"):
+        save_pipeline(_pipeline(), tmp_path / "rf.joblib", tmp_path / "store", ["low risk"])
+    assert not (tmp_path / "rf.joblib").exists()
+    assert not (tmp_path / "store").exists()
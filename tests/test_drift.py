@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from maternal_risk.data.profile import build_reference_profile
+from maternal_risk.features.build_features import FEATURE_COLUMNS
+from webapp.drift import DriftMonitor
+
+
+def _frame(rng, n, shift=0.0):
+    base = {
+        "Age": 30,
+        "SystolicBP": 120,
+        "DiastolicBP": 80,
+        "BS": 7,
+        "BodyTemp": 98.6,
+        "HeartRate": 75,
+    }
+    return pd.DataFrame({c: base[c] + shift + rng.normal(0, 5, n) for c in FEATURE_COLUMNS})
+
+
+def _monitor(rng):
+    X = _frame(rng, 2000)
+    y = rng.choice(["low risk", "mid risk", "high risk"], size=len(X))
+    return DriftMonitor(build_reference_profile(X, y), min_interval=0)
+
+
+def test_no_drift_on_reference_distribution():
+    rng = np.random.default_rng(0)
+    monitor = _monitor(rng)
+    for row in _frame(rng, 2000).to_dict(orient="records"):
+        monitor.update(row, "Low")
+
+    scores = monitor.scores()
+    assert scores["n"] == 2000
+    assert scores["drifted_features"] == []
+    assert all(s["psi"] < 0.1 for s in scores["features"].values())
+    assert scores["classes"]["proportions"]["low"] == 1.0
+
+
+def test_shifted_inputs_are_flagged():
+    rng = np.random.default_rng(0)
+    monitor = _monitor(rng)
+    for row in _frame(rng, 500, shift=10).to_dict(orient="records"):
+        monitor.update(row, "High Risk")
+
+    scores = monitor.scores()
+    assert set(scores["drifted_features"]) == set(FEATURE_COLUMNS)
+    assert scores["features"]["Age"]["ks"] > 0.5
+
+
+def test_drift_within_one_predicted_class():
+    rng = np.random.default_rng(0)
+    monitor = _monitor(rng)
+    for row in _frame(rng, 1000).to_dict(orient="records"):
+        monitor.update(row, "Low")
+    for row in _frame(rng, 300, shift=10).to_dict(orient="records"):
+        monitor.update(row, "High")
+
+    by_class = monitor.scores()["by_class"]
+    assert by_class["low"]["n"] == 1000
+    assert by_class["low"]["features"]["Age"]["psi"] < 0.1
+    assert by_class["high"]["features"]["Age"]["psi"] > 0.25
+    assert "mid" not in by_class  # no live predictions yet
+
+
+def test_shift_after_long_stable_stream_is_flagged():
+    rng = np.random.default_rng(0)
+    now = [0.0]
+    X = _frame(rng, 2000)
+    y = rng.choice(["low risk", "mid risk", "high risk"], size=len(X))
+    monitor = DriftMonitor(
+        build_reference_profile(X, y), min_interval=0, window=3600, clock=lambda: now[0]
+    )
+
+    for row in _frame(rng, 20_000).to_dict(orient="records"):  # a long stable hour
+        monitor.update(row, "Low")
+
+    now[0] = 3600  # new window: the stable hour is still in scope and dilutes the shift
+    shifted = _frame(rng, 500, shift=10).to_dict(orient="records")
+    for row in shifted:
+        monitor.update(row, "Low")
+    assert monitor.scores()["drifted_features"] == []
+
+    now[0] = 7200  # the stable hour has aged out
+    for row in shifted:
+        monitor.update(row, "Low")
+    scores = monitor.scores()
+    assert scores["n"] == 1000
+    assert set(scores["drifted_features"]) == set(FEATURE_COLUMNS)
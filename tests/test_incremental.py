@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from maternal_risk.models.incremental import refresh_partitions, warm_update
+from maternal_risk.models.train import build_pipeline
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "Age": rng.integers(15, 50, n),
+            "SystolicBP": rng.integers(90, 160, n),
+            "DiastolicBP": rng.integers(60, 100, n),
+            "BS": rng.uniform(6, 15, n).round(1),
+            "BodyTemp": rng.choice([98.0, 99.0], n),
+            "HeartRate": rng.integers(60, 90, n),
+        }
+    )
+    df["RiskLevel"] = np.where(df["SystolicBP"] > 140, "high risk", "low risk")
+    return df
+
+
+def test_only_new_partitions_are_processed(tmp_path):
+    raw_path = tmp_path / "base.csv"
+    partitions_dir = tmp_path / "partitions"
+    partitions_dir.mkdir()
+    _frame(50).to_csv(raw_path, index=False)
+    state = {"partitions": {}, "models": {}}
+
+    assert refresh_partitions(raw_path, partitions_dir, tmp_path / "processed", state) == [
+        "base.csv"
+    ]
+    assert refresh_partitions(raw_path, partitions_dir, tmp_path / "processed", state) == []
+
+    _frame(20, seed=1).to_csv(partitions_dir / "2026-01.csv", index=False)
+    new = refresh_partitions(raw_path, partitions_dir, tmp_path / "processed", state)
+    assert new == ["2026-01.csv"]
+    assert state["partitions"]["2026-01.csv"]["rows"] == 20
+    assert "pulse_pressure" in pd.read_parquet(state["partitions"]["base.csv"]["processed_path"])
+
+
+def test_warm_update_grows_existing_forest():
+    df = _frame(200)
+    X, y = df.drop(columns=["RiskLevel"]), (df["RiskLevel"] == "high risk").astype(int)
+    pipeline = build_pipeline("rf", random_state=0)
+    pipeline.named_steps["model"].set_params(n_estimators=10)
+    pipeline.fit(X, y)
+    first_tree = pipeline.named_steps["model"].estimators_[0]
+
+    mode = warm_update(pipeline, "rf", X, y, X, y, {"extra_estimators": 5})
+
+    assert mode == "warm_start"
+    assert len(pipeline.named_steps["model"].estimators_) == 15
+    assert pipeline.named_steps["model"].estimators_[0] is first_tree
@@ -0,0 +1,59 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from maternal_risk.features.build_features import FEATURE_COLUMNS, add_features
+from maternal_risk.models.lookup import build_lookup_table
+from webapp.lookup import LookupTable
+
+AXES = {
+    "Age": [10, 60, 10],
+    "SystolicBP": [70, 200, 10],
+    "DiastolicBP": [40, 140, 20],
+    "BS": [3, 30, 3],
+    "BodyTemp": [95, 105, 5],
+    "HeartRate": [40, 200, 40],
+}
+
+
+def _train_model(path):
+    # Risk depends only on SystolicBP thresholds that fall on grid points
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({c: rng.uniform(AXES[c][0], AXES[c][1], 500) for c in FEATURE_COLUMNS})
+    y = np.where(X["SystolicBP"] > 145, "high risk", "low risk")
+    model = DecisionTreeClassifier(max_depth=1).fit(add_features(X), y)
+    joblib.dump(model, path)
+
+
+def test_lookup_table_matches_model(tmp_path):
+    model_path = tmp_path / "tree.joblib"
+    _train_model(model_path)
+
+    meta = build_lookup_table(
+        model_path, tmp_path / "table", AXES, agreement_threshold=0.9, n_check=2000
+    )
+    assert meta["agreement"] >= 0.9
+
+    table = LookupTable(str(tmp_path / "table"))
+    features = {
+        "Age": 30,
+        "SystolicBP": 180,
+        "DiastolicBP": 80,
+        "BS": 7,
+        "BodyTemp": 98,
+        "HeartRate": 70,
+    }
+    assert table.predict(features) == "high risk"
+    assert table.predict({**features, "SystolicBP": 100}) == "low risk"
+    assert table.predict_proba(features)["high risk"] == 1.0
+
+
+def test_lookup_table_below_threshold_is_rejected(tmp_path):
+    model_path = tmp_path / "tree.joblib"
+    _train_model(model_path)
+
+    with pytest.raises(ValueError, match="below the threshold"):
+        build_lookup_table(model_path, tmp_path / "table", AXES, agreement_threshold=1.01)
+    assert not (tmp_path / "table").exists()
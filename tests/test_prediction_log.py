@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from maternal_risk.data.load_data import load_data, load_prediction_log
+from maternal_risk.data.validate import validate_schema
+from webapp.prediction_log import PredictionLogger
+
+FEATURES = {
+    "Age": 30,
+    "SystolicBP": 120,
+    "DiastolicBP": 80,
+    "BS": 6.5,
+    "BodyTemp": 98.6,
+    "HeartRate": 75,
+}
+
+
+def test_only_confirmed_outcomes_load_as_dataset(tmp_path):
+    db_path = str(tmp_path / "predictions.db")
+    logger = PredictionLogger(db_path, batch_size=2, flush_seconds=0.01)
+    for label in ["Low", "High Risk", "Mid"]:
+        assert logger.log(FEATURES, label, {label: 1.0}, "rf@abc", 0.002)
+    logger.close()
+    assert logger.stats()["written"] == 3
+
+    # Served predictions alone are not training data
+    with pytest.raises(ValueError, match="confirmed outcome"):
+        load_data(db_path)
+    served = load_prediction_log(db_path, label_source="served")
+    assert served["RiskLevel"].tolist() == ["low risk", "high risk", "mid risk"]
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE predictions SET confirmed_label = 'mid risk' WHERE id = 2")
+    df = load_data(db_path)
+    assert df["RiskLevel"].tolist() == ["mid risk"]
+    assert validate_schema(df).ok
+
+    meta = load_prediction_log(
+        db_path, model_version="rf@abc", include_metadata=True, label_source="served"
+    )
+    assert meta["latency_ms"].tolist() == [2.0, 2.0, 2.0]
+    assert load_prediction_log(db_path, model_version="other", label_source="served").empty
+
+
+def test_log_without_outcome_column_is_refused(tmp_path):
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE predictions (id INTEGER, risk_level TEXT)")
+    with pytest.raises(ValueError, match="no confirmed_label column"):
+        load_data(db_path)
+
+
+def test_full_queue_drops_newest(tmp_path):
+    logger = PredictionLogger(str(tmp_path / "predictions.db"), max_queue=1, flush_seconds=5)
+    results = [logger.log(FEATURES, "Low", None, "rf@abc", 0.001) for _ in range(50)]
+    logger.close()
+
+    assert results.count(False) == logger.stats()["dropped"] > 0
+    assert logger.stats()["written"] == results.count(True)
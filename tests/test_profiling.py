@@ -0,0 +1,38 @@
+import json
+
+from maternal_risk.evaluation.profiling import StageProfiler
+
+
+def test_stages_are_timed_and_reported(tmp_path):
+    profiler = StageProfiler(cprofile_dir=tmp_path / "prof")
+    with profiler.stage("load_data"):
+        sum(range(10_000))
+    for model_key in ["rf", "logreg"]:
+        with profiler.stage("fit", model_key):
+            data = [0] * 200_000
+            del data
+
+    assert [(t.stage, t.model_key) for t in profiler.timings] == [
+        ("load_data", ""),
+        ("fit", "rf"),
+        ("fit", "logreg"),
+    ]
+    assert profiler.timings[1].peak_mib > 1  # 200k list slots ~ 1.5 MiB
+    assert (tmp_path / "prof" / "rf_fit.prof").exists()
+
+    path = profiler.save(tmp_path / "profile.json", command="compare")
+    report = json.loads(path.read_text())
+    assert report["command"] == "compare"
+    assert len(report["stages"]) == 3
+    # Totals sum over both models
+    assert report["totals"]["fit"]["wall_seconds"] == sum(
+        t.wall_seconds for t in profiler.timings if t.stage == "fit"
+    )
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage("fit", "rf"):
+        pass
+    assert profiler.timings == []
+    assert profiler.totals() == {}
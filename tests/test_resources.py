@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from maternal_risk.models.registry import get_model_specs
+from maternal_risk.models.resources import budget_from_config, set_n_jobs
+from webapp.model import pin_single_thread
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "models"
+
+
+def test_budget_splits_cpus_between_outer_and_inner():
+    budget = budget_from_config({"resources": {"cpus": 8, "outer_jobs": 3}})
+    assert (budget.outer_jobs, budget.inner_threads) == (3, 2)
+
+    # Command-line override, clamped to the number of CPUs
+    budget = budget_from_config({"resources": {"cpus": 4, "outer_jobs": 1}}, outer_jobs=16)
+    assert (budget.outer_jobs, budget.inner_threads) == (4, 1)
+
+
+def test_specs_and_loaded_models_follow_the_budget():
+    specs = get_model_specs(n_jobs=3)
+    assert specs["rf"].estimator.n_jobs == 3
+    assert specs["xgboost"].estimator.n_jobs == 3
+
+    pipeline = Pipeline([("scaler", StandardScaler()), ("model", RandomForestClassifier())])
+    set_n_jobs(pipeline, 1)
+    assert pipeline.named_steps["model"].n_jobs == 1
+
+    logreg = LogisticRegression()
+    set_n_jobs(logreg, 4)
+    assert logreg.n_jobs is None
+
+
+def test_webapp_pins_committed_legacy_models():
+    # Pickled by an older scikit-learn: Pipeline.get_params() raises on these
+    for key in ["dummy", "mlp", "xgboost"]:
+        model = joblib.load(MODEL_DIR / f"{key}.joblib")
+        pin_single_thread(model)
+    assert model.named_steps["model"].n_jobs == 1
@@ -0,0 +1,87 @@
+import threading
+
+from webapp.shadow import CanaryRouter, ShadowEvaluator
+
+FEATURES = {
+    "Age": 30,
+    "SystolicBP": 120,
+    "DiastolicBP": 80,
+    "BS": 6.5,
+    "BodyTemp": 98.6,
+    "HeartRate": 75,
+}
+
+
+class ConstantModel:
+    def __init__(self, label, gate=None):
+        self.label = label
+        self.gate = gate
+
+    def predict(self, X):
+        if self.gate is not None:
+            self.gate.wait()
+        return [self.label] * len(X)
+
+
+def test_shadow_records_agreement_per_model():
+    shadow = ShadowEvaluator(
+        {"same": ConstantModel("low risk"), "other": ConstantModel("high risk")}
+    )
+    for _ in range(3):
+        assert shadow.submit(FEATURES, "Low Risk", 0.001)
+    shadow.join()
+
+    stats = shadow.stats()
+    assert stats["primary"]["n"] == 3
+    assert stats["candidates"]["same"]["agreement_rate"] == 1.0
+    assert stats["candidates"]["other"]["agreement_rate"] == 0.0
+    assert stats["dropped"] == 0
+
+
+def test_shadow_drops_work_when_queue_is_full():
+    gate = threading.Event()
+    shadow = ShadowEvaluator({"slow": ConstantModel("low risk", gate=gate)}, max_queue=1)
+
+    accepted = [shadow.submit(FEATURES, "Low Risk", 0.001) for _ in range(5)]
+    gate.set()
+    shadow.join()
+
+    assert not all(accepted)
+    assert shadow.stats()["dropped"] == accepted.count(False)
+
+
+def test_canary_percent_bounds():
+    assert CanaryRouter(ConstantModel("x"), "cand", 0).use_canary() is False
+    assert CanaryRouter(ConstantModel("x"), "cand", 150).use_canary() is True
+
+
+def test_canary_traffic_is_compared_with_primary_in_background():
+    canary = CanaryRouter(ConstantModel("high risk"), "cand", 100)
+    shadow = ShadowEvaluator(
+        {"same": ConstantModel("low risk")},
+        primary=lambda features: "Low Risk",
+        canary=canary,
+    )
+    for _ in range(2):
+        canary.record("cand", 0.002)
+        assert shadow.submit_canary(FEATURES, "High Risk")
+    shadow.join()
+
+    stats = canary.stats()
+    assert stats["served"] == {"primary": 0, "cand": 2}
+    assert stats["canary"]["latency_ms_mean"] == 2.0
+    assert stats["canary"]["compared"] == 2
+    assert stats["canary"]["agreement_rate"] == 0.0
+    # Shadow candidates also see canary-served inputs
+    assert shadow.stats()["candidates"]["same"]["agreement_rate"] == 1.0
+
+
+def test_candidates_are_decoded_with_their_own_labels():
+    # Integer output decoded by the candidate's manifest (2 -> "low risk" -> "Low")
+    # agrees with the primary's "Low Risk"
+    shadow = ShadowEvaluator(
+        {"encoded": ConstantModel(2)}, label_names={"encoded": {2: "low risk"}}
+    )
+    assert shadow.submit(FEATURES, "Low Risk", 0.001)
+    shadow.join()
+    assert shadow.stats()["candidates"]["encoded"]["agreement_rate"] == 1.0
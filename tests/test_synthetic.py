@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from maternal_risk.data.synthetic import fit_synthesizer, generate_chunks, write_synthetic
+from maternal_risk.data.validate import REQUIRED_COLUMNS, validate_schema
+
+
+def _real_data(n=300):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "Age": rng.integers(15, 50, n),
+            "SystolicBP": rng.integers(90, 160, n),
+            "DiastolicBP": rng.integers(60, 100, n),
+            "BS": rng.uniform(6, 15, n).round(1),
+            "BodyTemp": rng.choice([98.0, 99.0, 100.0], n),
+            "HeartRate": rng.integers(60, 90, n),
+        }
+    )
+    df["RiskLevel"] = np.where(df["SystolicBP"] > 140, "high risk", "low risk")
+    return df
+
+
+def test_synthetic_chunks_match_schema_and_ranges():
+    real = _real_data()
+    synth = fit_synthesizer(real)
+
+    chunks = list(generate_chunks(synth, 2500, chunk_size=1000))
+    assert [len(c) for c in chunks] == [1000, 1000, 500]
+
+    df = pd.concat(chunks, ignore_index=True)
+    assert tuple(df.columns) == REQUIRED_COLUMNS
+    assert validate_schema(df).ok
+    assert df["Age"].between(real["Age"].min(), real["Age"].max()).all()
+    assert set(df["RiskLevel"]) == {"low risk", "high risk"}
+    # Class structure is preserved: high-risk rows have the higher SystolicBP
+    means = df.groupby("RiskLevel")["SystolicBP"].mean()
+    assert means["high risk"] > means["low risk"]
+
+
+def test_write_synthetic_csv_streams_all_rows(tmp_path):
+    synth = fit_synthesizer(_real_data())
+    out = write_synthetic(synth, 1234, tmp_path / "synthetic.csv", chunk_size=500)
+    assert len(pd.read_csv(out)) == 1234
@@ -0,0 +1,111 @@
+import asyncio
+import math
+import os
+import time
+
+from fastapi import HTTPException
+
+# Predictions running at once (each occupies one threadpool thread)
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", str(os.cpu_count() or 1)))
+# Requests allowed to wait for a slot; beyond that they are rejected immediately
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+# Longest a request may wait for a slot before it is rejected
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "2.0"))
+
+_controller = None
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, deadline-aware wait queue.
+
+    Runs on the event loop, before the request is handed to the threadpool,
+    so shed requests never tie up a worker thread. A request is rejected
+    (503 + Retry-After) when the queue is full, when the expected wait
+    (queue length x average service time) already exceeds `max_wait`, or
+    when it actually waited `max_wait` without getting a slot.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, max_wait: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0  # admitted requests, running or waiting for a slot
+        self.active = 0
+        self.rejected = 0
+        self.service_time = 0.0  # moving average, seconds
+
+    @property
+    def waiting(self) -> int:
+        return self.in_flight - self.active
+
+    def expected_wait(self) -> float:
+        queued_ahead = max(0, self.in_flight - self.max_concurrent)
+        return (queued_ahead + 1) * self.service_time / self.max_concurrent
+
+    def _reject(self, reason: str) -> HTTPException:
+        self.rejected += 1
+        retry_after = max(1, math.ceil(self.expected_wait()))
+        return HTTPException(
+            status_code=503,
+            detail=f"Server busy ({reason}), please retry.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self) -> None:
+        # Decided on our own counter before the first await: on Python < 3.12
+        # wait_for runs the semaphore acquire in a separate task, so every
+        # request of a simultaneous burst would still see a free semaphore.
+        if self.in_flight >= self.max_concurrent:
+            if self.in_flight - self.max_concurrent >= self.max_queue:
+                raise self._reject("queue full")
+            if self.expected_wait() > self.max_wait:
+                raise self._reject("expected wait too long")
+
+        self.in_flight += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.in_flight -= 1
+            raise self._reject("timed out waiting") from None
+        except BaseException:  # cancelled (client went away): give the place back
+            self.in_flight -= 1
+            raise
+        self.active += 1
+
+    def release(self, seconds: float) -> None:
+        self.in_flight -= 1
+        self.active -= 1
+        self._semaphore.release()
+        self.service_time = seconds if self.service_time == 0 else (
+            0.9 * self.service_time + 0.1 * seconds
+        )
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "service_ms": 1000 * self.service_time,
+        }
+
+
+def get_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController(
+            ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_MAX_WAIT
+        )
+    return _controller
+
+
+async def admit():
+    """FastAPI dependency: hold an admission slot for the duration of the request."""
+    controller = get_controller()
+    await controller.acquire()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        controller.release(time.perf_counter() - start)
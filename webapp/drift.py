@@ -0,0 +1,205 @@
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from pathlib import Path
+
+from webapp.model import MODEL_PATH, label_key
+
+# Reference profile written by train.py next to the model (models/<key>.profile.json)
+DRIFT_PROFILE_PATH = os.getenv(
+    "DRIFT_PROFILE_PATH", str(Path(MODEL_PATH).with_suffix(".profile.json"))
+)
+# Minimum seconds between two recomputations of the drift scores
+DRIFT_INTERVAL = float(os.getenv("DRIFT_INTERVAL", "60"))
+# Scores cover the last full window of this many seconds plus the current one
+DRIFT_WINDOW = float(os.getenv("DRIFT_WINDOW", "3600"))
+
+# Common PSI reading: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_ALERT = 0.25
+
+_monitor = None
+_monitor_checked = False
+
+
+def psi(expected: list, actual: list, eps: float = 1e-4) -> float:
+    """Population Stability Index between two binned distributions (proportions)."""
+    total = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, eps), max(a, eps)
+        total += (a - e) * math.log(a / e)
+    return total
+
+
+def ks(expected: list, actual: list) -> float:
+    """Kolmogorov-Smirnov statistic computed on the binned CDFs."""
+    cdf_e = cdf_a = stat = 0.0
+    for e, a in zip(expected, actual):
+        cdf_e += e
+        cdf_a += a
+        stat = max(stat, abs(cdf_e - cdf_a))
+    return stat
+
+
+def _proportions(counts: list) -> list:
+    total = sum(counts)
+    return [c / total for c in counts] if total else [0.0] * len(counts)
+
+
+def _feature_scores(reference: dict, counts: dict) -> dict:
+    """{feature: {"psi", "ks"}} of live bin counts against reference proportions."""
+    scores = {}
+    for name, feature_counts in counts.items():
+        actual = _proportions(feature_counts)
+        scores[name] = {"psi": psi(reference[name], actual), "ks": ks(reference[name], actual)}
+    return scores
+
+
+class DriftMonitor:
+    """
+    Streaming histograms of live inputs per predicted class, compared against
+    the training reference profile overall and class by class.
+
+    Memory is fixed (one counter per reference bin, per feature and class,
+    plus a bucket for labels the profile does not know). An update is a
+    bisect over ~10 edges plus a counter increment per feature. Updates take
+    no lock: under heavy concurrency an increment can occasionally be lost,
+    which does not matter for a distribution estimate. Scores are computed
+    on a copy of the counters.
+
+    Counters rotate every `window` seconds and scores cover the previous
+    window plus the current one, so drift that starts after a long stable
+    period is not averaged away by old traffic (windows older than that are
+    dropped).
+    """
+
+    def __init__(
+        self, profile: dict, min_interval: float = 60.0, window: float = 3600.0, clock=None
+    ):
+        self.profile = profile
+        self.min_interval = min_interval
+        self.window = window
+        self._clock = clock or time.monotonic
+        self._rotate_lock = threading.Lock()
+        self._edges = {name: f["edges"] for name, f in profile["features"].items()}
+        self._classes = {label_key(c): p for c, p in profile["classes"].items()}
+        # Profiles written before per-class histograms have no "by_class"
+        self._by_class = {label_key(c): f for c, f in profile.get("by_class", {}).items()}
+        self._scores = None
+        self._scores_at = 0.0
+        self.reset()
+
+    def _empty_counts(self) -> dict:
+        # predicted class -> feature -> bin counts; None collects unknown labels
+        return {
+            key: {name: [0] * (len(e) + 1) for name, e in self._edges.items()}
+            for key in [*self._classes, None]
+        }
+
+    def reset(self) -> None:
+        self._previous = self._empty_counts()
+        self._counts = self._empty_counts()
+        self._window_start = self._clock()
+        self._scores = None
+
+    def _rotate(self) -> None:
+        """Start a new window once the current one is `window` seconds old."""
+        now = self._clock()
+        if now - self._window_start < self.window:
+            return
+        with self._rotate_lock:
+            elapsed = now - self._window_start
+            if elapsed < self.window:
+                return  # another thread rotated first
+            # After a gap longer than a window the current counts are stale too
+            self._previous = self._counts if elapsed < 2 * self.window else self._empty_counts()
+            self._counts = self._empty_counts()
+            self._window_start = now
+
+    def update(self, features: dict, label: str) -> None:
+        self._rotate()
+        key = label_key(label)
+        counts = self._counts[key if key in self._classes else None]
+        for name, edges in self._edges.items():
+            counts[name][bisect_right(edges, float(features[name]))] += 1
+
+    def _snapshot(self) -> dict:
+        """Previous + current window counts, copied so updates can't change them mid-score."""
+        previous, current = self._previous, self._counts
+        return {
+            key: {
+                name: [a + b for a, b in zip(previous[key][name], counts)]
+                for name, counts in per_feature.items()
+            }
+            for key, per_feature in current.items()
+        }
+
+    def _compute(self) -> dict:
+        counts = self._snapshot()
+        first = next(iter(self._edges))
+        class_n = {key: sum(per_feature[first]) for key, per_feature in counts.items()}
+        n = sum(class_n.values())
+
+        overall = {
+            name: [sum(col) for col in zip(*(c[name] for c in counts.values()))]
+            for name in self._edges
+        }
+        reference = {name: f["proportions"] for name, f in self.profile["features"].items()}
+        features = _feature_scores(reference, overall)
+
+        total = sum(class_n[k] for k in self._classes)
+        expected = list(self._classes.values())
+        actual = [class_n[k] / total if total else 0.0 for k in self._classes]
+        classes = {
+            "psi": psi(expected, actual),
+            "proportions": dict(zip(self._classes, actual)),
+        }
+
+        by_class = {}
+        for key in self._classes:
+            if key in self._by_class and class_n[key]:
+                by_class[key] = {
+                    "n": class_n[key],
+                    "features": _feature_scores(self._by_class[key], counts[key]),
+                }
+
+        drifted = [name for name, s in features.items() if s["psi"] > PSI_ALERT]
+        return {
+            "n": n,
+            "features": features,
+            "classes": classes,
+            "by_class": by_class,
+            "drifted_features": drifted,
+            "window_seconds": self.window,
+            "computed_at": time.time(),
+        }
+
+    def scores(self, force: bool = False) -> dict:
+        """Drift scores, recomputed at most once every `min_interval` seconds."""
+        self._rotate()
+        now = time.monotonic()
+        if force or self._scores is None or now - self._scores_at >= self.min_interval:
+            self._scores = self._compute()
+            self._scores_at = now
+        return self._scores
+
+
+def get_monitor():
+    """Drift monitor for MODEL_PATH, or None if no reference profile is available."""
+    global _monitor, _monitor_checked
+    if not _monitor_checked:
+        _monitor_checked = True
+        if os.path.exists(DRIFT_PROFILE_PATH):
+            profile = json.loads(Path(DRIFT_PROFILE_PATH).read_text())
+            _monitor = DriftMonitor(profile, min_interval=DRIFT_INTERVAL, window=DRIFT_WINDOW)
+        else:
+            print(f"No reference profile at {DRIFT_PROFILE_PATH}; drift monitoring disabled.")
+    return _monitor
+
+
+def record_prediction(features: dict, label: str) -> None:
+    monitor = get_monitor()
+    if monitor is not None:
+        monitor.update(features, label)
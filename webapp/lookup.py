@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+class LookupTable:
+    """
+    Precomputed predictions over a quantized input grid
+    (built offline by `python -m maternal_risk.models.lookup`).
+
+    Arrays are memory-mapped, so loading is cheap and a prediction is just
+    index arithmetic + one array read.
+    """
+
+    def __init__(self, path: str):
+        path = Path(path)
+        self.meta = json.loads((path / "meta.json").read_text())
+        self.axes = self.meta["axes"]
+        self.classes = self.meta["classes"]
+        self.labels = np.load(path / "labels.npy", mmap_mode="r")
+        self.proba = np.load(path / "proba.npy", mmap_mode="r")
+
+    def index(self, features: dict) -> tuple:
+        """Nearest grid point for one request (values outside the grid are clipped)."""
+        idx = []
+        for axis in self.axes:
+            i = round((float(features[axis["name"]]) - axis["start"]) / axis["step"])
+            idx.append(min(max(i, 0), axis["size"] - 1))
+        return tuple(idx)
+
+    def predict(self, features: dict):
+        return self.classes[int(self.labels[self.index(features)])]
+
+    def predict_proba(self, features: dict) -> dict:
+        p = self.proba[self.index(features)]
+        return {str(c): float(v) / 255.0 for c, v in zip(self.classes, p)}
@@ -1,12 +1,23 @@
 import os
-from fastapi import FastAPI, Request, Form
+
+# One OpenMP/BLAS thread per worker: uvicorn already runs requests in parallel.
+# Thread pools read these when numpy/scipy/xgboost load, so set them before any
+# import below pulls those in (an explicit setting in the environment wins).
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from fastapi import Depends, FastAPI, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import ValidationError
 
 from webapp.schemas import PredictRequest
-from webapp.model import predict_risk, get_model
+from webapp.model import get_model, get_lookup
+from webapp.shadow import serve_prediction, shadow_stats
+from webapp.drift import get_monitor, record_prediction
+from webapp.prediction_log import get_logger, log_prediction
+from webapp.admission import admit, get_controller
 
 app = FastAPI(title="Maternal Risk Predictor")
 
@@ -22,9 +33,28 @@ templates = Jinja2Templates(directory="webapp")
 async def startup_event():
     """Load model into memory on startup to avoid cold start delays."""
     get_model()
+    if get_lookup() is not None:
+        print("Lookup table loaded!")
+    shadow_stats()  # loads shadow/canary models, if configured
+    get_monitor()
+    get_logger()
     print("Model loaded and ready!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending prediction log records before the process exits."""
+    logger = get_logger()
+    if logger is not None:
+        logger.close()
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness check: no template rendering, no threadpool, never shed."""
+    return {"status": "ok", "admission": get_controller().stats()}
+
+
 @app.get("/", response_class=HTMLResponse)
 def home(request: Request):
     return templates.TemplateResponse(
@@ -62,7 +92,7 @@ def contact(request: Request):
     return templates.TemplateResponse("contact.html", {"request": request})
 
 
-@app.post("/predict", response_class=HTMLResponse)
+@app.post("/predict", response_class=HTMLResponse, dependencies=[Depends(admit)])
 def predict_form(
     request: Request,
     Age: float = Form(...),
@@ -82,9 +112,11 @@ def predict_form(
             HeartRate=HeartRate,
         ).model_dump()
 
-        result = predict_risk(payload)
+        prediction = serve_prediction(payload)
+        record_prediction(payload, prediction.label)
+        log_prediction(payload, prediction)
         return templates.TemplateResponse(
-            "index.html", {"request": request, "result": result, "error": None}
+            "index.html", {"request": request, "result": prediction.label, "error": None}
         )
 
     except ValidationError as e:
@@ -96,7 +128,25 @@ def predict_form(
 
 
 # Optional: JSON API (useful for frontend later)
-@app.post("/api/predict")
+@app.post("/api/predict", dependencies=[Depends(admit)])
 def predict_api(req: PredictRequest):
-    risk = predict_risk(req.model_dump())
-    return {"risk_level": risk}
+    payload = req.model_dump()
+    prediction = serve_prediction(payload)
+    record_prediction(payload, prediction.label)
+    log_prediction(payload, prediction)
+    return {"risk_level": prediction.label}
+
+
+@app.get("/api/shadow")
+def shadow_api():
+    """Agreement and latency of shadow/canary models vs. the primary model."""
+    return shadow_stats()
+
+
+@app.get("/api/drift")
+def drift_api(force: bool = False):
+    """PSI/KS of live inputs and predicted classes vs. the training reference profile."""
+    monitor = get_monitor()
+    if monitor is None:
+        return {"enabled": False}
+    return {"enabled": True, **monitor.scores(force=force)}
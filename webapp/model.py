@@ -1,11 +1,24 @@
+import hashlib
+import json
 import os
+from dataclasses import dataclass
+
 import joblib
 import pandas as pd
 
+from webapp.lookup import LookupTable
+
 # Default to Random Forest (best performing model)
 MODEL_PATH = os.getenv("MODEL_PATH", "models/rf.joblib")
 
+# Optional precomputed lookup table for MODEL_PATH (see maternal_risk.models.lookup)
+LOOKUP_PATH = os.getenv("LOOKUP_PATH", "")
+
 _model = None
+_label_names = None  # model output class -> label, from the model's manifest
+_lookup = None
+_lookup_checked = False
+_versions = {}
 
 # Feature names must match the order used during training
 FEATURE_NAMES = [
@@ -19,27 +32,145 @@ FEATURE_NAMES = [
 ]
 
 
+@dataclass(frozen=True)
+class Prediction:
+    """A served prediction, as passed to shadow evaluation, drift monitoring and logging."""
+
+    label: str
+    probabilities: dict
+    model_version: str
+    latency: float
+
+
+def manifest_path_for(model_path: str) -> str:
+    """models/rf.joblib -> models/rf.manifest.json (written by the artifact store)."""
+    return os.path.splitext(model_path)[0] + ".manifest.json"
+
+
+def check_manifest(model, model_path: str, manifest: dict) -> dict:
+    """
+    Make sure the loaded model is the one the manifest describes and that it
+    expects the features this app sends. Returns {model class: label}.
+    """
+    sha256 = _file_sha256(model_path)
+    if manifest["sha256"] != sha256:
+        raise RuntimeError(
+            f"{model_path} does not match its manifest "
+            f"(sha256 {sha256[:12]} != {manifest['sha256'][:12]})"
+        )
+    if manifest["feature_names"] and manifest["feature_names"] != FEATURE_NAMES:
+        raise RuntimeError(
+            f"{model_path} was trained on {manifest['feature_names']}, "
+            f"but the app sends {FEATURE_NAMES}"
+        )
+    classes = [c.item() if hasattr(c, "item") else c for c in model.classes_]
+    if classes != manifest["classes"]:
+        raise RuntimeError(
+            f"{model_path} classes {classes} do not match its manifest {manifest['classes']}"
+        )
+    return dict(zip(manifest["classes"], manifest["label_names"]))
+
+
+def pin_single_thread(model) -> None:
+    """
+    Serve each prediction on one thread: uvicorn already runs requests in
+    parallel, so a model trained with n_jobs > 1 would oversubscribe the cores.
+    """
+    steps = [step for _, step in model.steps] if hasattr(model, "steps") else [model]
+    for step in steps:
+        try:
+            params = step.get_params(deep=False)
+        except AttributeError:  # pickled by an older scikit-learn; predict still works
+            continue
+        if "n_jobs" in params:
+            step.set_params(n_jobs=1)
+
+
+def load_model(path: str) -> tuple:
+    """
+    Load a model for serving: check it against its manifest (if any) and pin
+    it to one thread. Returns (model, {model class: label} or None).
+    """
+    model = joblib.load(path)
+    label_names = None
+    manifest_path = manifest_path_for(path)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            label_names = check_manifest(model, path, json.load(f))
+    else:
+        print(f"No manifest for {path}; skipping artifact checks.")
+    pin_single_thread(model)
+    return model, label_names
+
+
 def get_model():
-    global _model
+    global _model, _label_names
     if _model is None:
-        _model = joblib.load(MODEL_PATH)
+        model, _label_names = load_model(MODEL_PATH)
+        _model = model
     return _model
 
 
-def predict_risk(features: dict) -> str:
-    """
-    features keys must match training column names:
-    Age, SystolicBP, DiastolicBP, BS, BodyTemp, HeartRate
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
 
-    Note: Model was trained with pulse_pressure feature (SystolicBP - DiastolicBP)
+
+def model_version(path: str) -> str:
+    """Model identifier for logs: <file stem>@<first 12 hex chars of sha256>."""
+    if path not in _versions:
+        _versions[path] = f"{os.path.splitext(os.path.basename(path))[0]}@{_file_sha256(path)[:12]}"
+    return _versions[path]
+
+
+def get_lookup():
     """
-    model = get_model()
+    Load the lookup table if LOOKUP_PATH is set and it was built from MODEL_PATH.
+    Returns None otherwise (predictions then go through the model).
+    """
+    global _lookup, _lookup_checked
+    if not _lookup_checked:
+        _lookup_checked = True
+        if LOOKUP_PATH:
+            get_model()  # label names come from the model's manifest
+            table = LookupTable(LOOKUP_PATH)
+            if table.meta.get("model_sha256") == _file_sha256(MODEL_PATH):
+                _lookup = table
+            else:
+                print(f"Lookup table {LOOKUP_PATH} was not built from {MODEL_PATH}; ignoring it.")
+    return _lookup
+
+
+def label_key(label) -> str:
+    """Comparable form of a label: "low risk", "Low Risk" and "Low" -> "low"."""
+    return str(label).strip().lower().replace(" risk", "")
+
+
+def _format_label(pred, label_names=None) -> str:
+    # label order recorded at training time, e.g. 0 -> "high risk" -> "High"
+    if label_names is not None and pred in label_names:
+        return str(label_names[pred]).replace(" risk", "").title()
 
+    # adapt mapping if your model outputs numbers
+    # e.g. 0/1/2 -> Low/Mid/High
+    if str(pred).isdigit():
+        mapping = {0: "Low", 1: "Mid", 2: "High"}
+        return mapping.get(int(pred), str(pred))
+
+    # if your model outputs strings already
+    return str(pred).title()
+
+
+def features_frame(features: dict) -> pd.DataFrame:
+    """Single-row model input (adds the engineered pulse_pressure feature)."""
     # Add engineered feature: pulse_pressure
     pulse_pressure = features["SystolicBP"] - features["DiastolicBP"]
 
     # Create DataFrame with feature names to avoid sklearn warning
-    X = pd.DataFrame(
+    return pd.DataFrame(
         [
             [
                 features["Age"],
@@ -54,13 +185,49 @@ def predict_risk(features: dict) -> str:
         columns=FEATURE_NAMES,
     )
 
-    pred = model.predict(X)[0]
 
-    # adapt mapping if your model outputs numbers
-    # e.g. 0/1/2 -> Low/Mid/High
-    if str(pred).isdigit():
-        mapping = {0: "Low", 1: "Mid", 2: "High"}
-        return mapping.get(int(pred), str(pred))
+def predict_with_model(model, features: dict, label_names=None) -> str:
+    """`label_names` decodes model classes (from that model's manifest, see load_model)."""
+    pred = model.predict(features_frame(features))[0]
+    return _format_label(pred, label_names)
 
-    # if your model outputs strings already
-    return str(pred).title()
+
+def predict_with_proba(model, features: dict, label_names=None) -> tuple:
+    """(label, {label: probability}) from a single predict_proba call."""
+    if not hasattr(model, "predict_proba"):
+        return predict_with_model(model, features, label_names), None
+
+    proba = model.predict_proba(features_frame(features))[0]
+    best = max(range(len(proba)), key=lambda i: proba[i])
+    probabilities = {
+        _format_label(c, label_names): float(p) for c, p in zip(model.classes_, proba)
+    }
+    return _format_label(model.classes_[best], label_names), probabilities
+
+
+def predict_risk_proba(features: dict) -> tuple:
+    """Like predict_risk, but also returns class probabilities (None if unavailable)."""
+    lookup = get_lookup()
+    if lookup is not None:
+        probabilities = {
+            _format_label(c, _label_names): p for c, p in lookup.predict_proba(features).items()
+        }
+        return _format_label(lookup.predict(features), _label_names), probabilities
+
+    model = get_model()
+    return predict_with_proba(model, features, _label_names)
+
+
+def predict_risk(features: dict) -> str:
+    """
+    features keys must match training column names:
+    Age, SystolicBP, DiastolicBP, BS, BodyTemp, HeartRate
+
+    Note: Model was trained with pulse_pressure feature (SystolicBP - DiastolicBP)
+    """
+    lookup = get_lookup()
+    if lookup is not None:
+        return _format_label(lookup.predict(features), _label_names)
+
+    model = get_model()
+    return predict_with_model(model, features, _label_names)
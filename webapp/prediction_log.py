@@ -0,0 +1,198 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from webapp.model import Prediction
+
+# SQLite database receiving every served prediction (empty string disables logging)
+PREDICTION_LOG_PATH = os.getenv("PREDICTION_LOG_PATH", "logs/predictions.db")
+PREDICTION_LOG_QUEUE_SIZE = int(os.getenv("PREDICTION_LOG_QUEUE_SIZE", "10000"))
+PREDICTION_LOG_BATCH_SIZE = int(os.getenv("PREDICTION_LOG_BATCH_SIZE", "200"))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "1.0"))
+# What to do when the queue is full: drop_newest, drop_oldest or block
+PREDICTION_LOG_POLICY = os.getenv("PREDICTION_LOG_POLICY", "drop_newest")
+PREDICTION_LOG_BLOCK_SECONDS = float(os.getenv("PREDICTION_LOG_BLOCK_SECONDS", "0.05"))
+
+# Keep in sync with maternal_risk.data.load_data.load_prediction_log
+FEATURE_COLUMNS = ["Age", "SystolicBP", "DiastolicBP", "BS", "BodyTemp", "HeartRate"]
+
+_CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    model_version TEXT NOT NULL,
+    {", ".join(f"{c} REAL NOT NULL" for c in FEATURE_COLUMNS)},
+    risk_level TEXT NOT NULL,
+    probabilities TEXT,
+    latency_ms REAL NOT NULL,
+    confirmed_label TEXT
+)
+"""
+_INSERT = (
+    f"INSERT INTO predictions (ts, model_version, {', '.join(FEATURE_COLUMNS)}, "
+    "risk_level, probabilities, latency_ms) "
+    f"VALUES ({', '.join(['?'] * (len(FEATURE_COLUMNS) + 5))})"
+)
+
+POLICIES = ("drop_newest", "drop_oldest", "block")
+
+_logger = None
+_logger_checked = False
+
+
+class PredictionLogger:
+    """
+    Append-only prediction log with batched, non-blocking writes.
+
+    The request path only enqueues a tuple. A background thread drains the
+    queue and writes up to `batch_size` rows per transaction into SQLite
+    (WAL mode, so readers never block the writer). When the queue is full,
+    records are handled according to `policy` and counted in `dropped`.
+
+    `risk_level` is what the app served. `confirmed_label` stays NULL until
+    the observed outcome is filled in (e.g. `UPDATE predictions SET
+    confirmed_label = 'high risk' WHERE id = ...`); only confirmed rows are
+    used as training data (see maternal_risk.data.load_data).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_seconds: float = 1.0,
+        policy: str = "drop_newest",
+        block_seconds: float = 0.05,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown prediction log policy '{policy}'. Available: {POLICIES}")
+
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self.dropped = 0
+        self.written = 0
+        self._counts_lock = threading.Lock()  # request threads and the writer both count
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_CREATE_TABLE)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(predictions)")]
+            if "confirmed_label" not in columns:  # log created before outcomes were tracked
+                conn.execute("ALTER TABLE predictions ADD COLUMN confirmed_label TEXT")
+
+        self._writer = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._writer.start()
+
+    def log(
+        self, features: dict, label: str, probabilities, model_version: str, latency: float
+    ) -> bool:
+        """Enqueue one prediction; returns False if a record had to be dropped."""
+        record = (
+            time.time(),
+            model_version,
+            *(float(features[c]) for c in FEATURE_COLUMNS),
+            label,
+            json.dumps(probabilities) if probabilities is not None else None,
+            1000 * latency,
+        )
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._counts_lock:
+            self.dropped += 1
+        return False
+
+    def _drain(self) -> list:
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_seconds))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while not (self._stop.is_set() and self._queue.empty()):
+                batch = self._drain()
+                if not batch:
+                    continue
+                try:
+                    with conn:
+                        conn.executemany(_INSERT, batch)
+                    with self._counts_lock:
+                        self.written += len(batch)
+                except sqlite3.Error as e:  # keep serving even if the disk is unhappy
+                    with self._counts_lock:
+                        self.dropped += len(batch)
+                    print(f"Prediction log write failed ({len(batch)} records dropped): {e}")
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Flush everything still queued and stop the writer thread."""
+        self._stop.set()
+        self._writer.join()
+
+    def stats(self) -> dict:
+        with self._counts_lock:
+            return {
+                "path": self.db_path,
+                "policy": self.policy,
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "dropped": self.dropped,
+            }
+
+
+def get_logger():
+    global _logger, _logger_checked
+    if not _logger_checked:
+        _logger_checked = True
+        if PREDICTION_LOG_PATH:
+            _logger = PredictionLogger(
+                PREDICTION_LOG_PATH,
+                max_queue=PREDICTION_LOG_QUEUE_SIZE,
+                batch_size=PREDICTION_LOG_BATCH_SIZE,
+                flush_seconds=PREDICTION_LOG_FLUSH_SECONDS,
+                policy=PREDICTION_LOG_POLICY,
+                block_seconds=PREDICTION_LOG_BLOCK_SECONDS,
+            )
+    return _logger
+
+
+def log_prediction(features: dict, prediction: Prediction) -> None:
+    logger = get_logger()
+    if logger is not None:
+        logger.log(
+            features,
+            prediction.label,
+            prediction.probabilities,
+            prediction.model_version,
+            prediction.latency,
+        )
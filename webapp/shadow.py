@@ -0,0 +1,265 @@
+import os
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+
+from webapp.model import (
+    MODEL_PATH,
+    Prediction,
+    label_key,
+    load_model,
+    model_version,
+    predict_risk,
+    predict_risk_proba,
+    predict_with_model,
+    predict_with_proba,
+)
+
+# Candidate models evaluated on copies of live inputs (comma-separated paths)
+SHADOW_MODEL_PATHS = os.getenv("SHADOW_MODEL_PATHS", "")
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "256"))
+
+# Candidate model that serves a percentage of live traffic
+CANARY_MODEL_PATH = os.getenv("CANARY_MODEL_PATH", "")
+CANARY_PERCENT = float(os.getenv("CANARY_PERCENT", "0"))
+
+# What a model that is incompatible with the live inputs raises from predict
+# (XGBoostError subclasses ValueError)
+PREDICT_ERRORS = (ValueError, TypeError, AttributeError, KeyError, IndexError)
+
+_shadow = None
+_canary = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class _ModelStats:
+    """Latency and agreement counters for one model (callers hold the owner's lock)."""
+
+    def __init__(self):
+        self.n = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.compared = 0
+        self.agree = 0
+
+    def record(self, latency: float) -> None:
+        self.n += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def record_agreement(self, agree: bool) -> None:
+        self.compared += 1
+        if agree:
+            self.agree += 1
+
+    def to_dict(self, with_agreement: bool = True) -> dict:
+        out = {
+            "n": self.n,
+            "latency_ms_mean": 1000 * self.latency_sum / self.n if self.n else None,
+            "latency_ms_max": 1000 * self.latency_max,
+        }
+        if with_agreement:
+            out["compared"] = self.compared
+            out["agreement_rate"] = self.agree / self.compared if self.compared else None
+        return out
+
+
+class ShadowEvaluator:
+    """
+    Runs candidate models on copies of live inputs in a background thread.
+
+    The request path only does a non-blocking put on a bounded queue: when
+    the queue is full the shadow work is dropped (and counted), never waited on.
+
+    Inputs served by the canary arrive without a primary answer; the worker
+    computes it with `primary` (off the request path), compares the canary's
+    answer to it via `canary.record_agreement`, and uses it for the candidates.
+
+    `label_names` maps a candidate name to its own class -> label decoding (from
+    its manifest). Labels are compared with `label_key`, so "Low" (decoded
+    integer output) agrees with "Low Risk" (string output).
+    """
+
+    def __init__(
+        self,
+        candidates: dict,
+        max_queue: int = 256,
+        primary=None,
+        canary=None,
+        label_names=None,
+    ):
+        self.candidates = candidates
+        self.label_names = label_names or {}
+        self.primary = primary
+        self.canary = canary
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats = {name: _ModelStats() for name in candidates}
+        self._primary = _ModelStats()
+        self.dropped = 0
+        self._worker = threading.Thread(target=self._run, name="shadow-eval", daemon=True)
+        self._worker.start()
+
+    def submit(self, features: dict, primary_label: str, primary_latency: float) -> bool:
+        with self._lock:
+            self._primary.record(primary_latency)
+        return self._put((dict(features), primary_label, None))
+
+    def submit_canary(self, features: dict, canary_label: str) -> bool:
+        """Queue a canary-served input; the primary model is run on it in the background."""
+        return self._put((dict(features), None, canary_label))
+
+    def _put(self, item: tuple) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            features, primary_label, canary_label = item
+            if primary_label is None:
+                try:
+                    primary_label = self.primary(features)
+                except PREDICT_ERRORS as e:
+                    print(f"Primary model failed on a canary input: {e}")
+                    continue
+                self.canary.record_agreement(label_key(canary_label) == label_key(primary_label))
+
+            for name, model in self.candidates.items():
+                start = time.perf_counter()
+                try:
+                    label = predict_with_model(model, features, self.label_names.get(name))
+                except PREDICT_ERRORS as e:  # a broken candidate must not kill the worker
+                    print(f"Shadow model '{name}' failed: {e}")
+                    continue
+                latency = time.perf_counter() - start
+                with self._lock:
+                    self._stats[name].record(latency)
+                    self._stats[name].record_agreement(label_key(label) == label_key(primary_label))
+
+    def join(self) -> None:
+        """Wait until every queued input has been evaluated, then stop the worker."""
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "primary": self._primary.to_dict(with_agreement=False),
+                "candidates": {name: s.to_dict() for name, s in self._stats.items()},
+                "dropped": self.dropped,
+                "queue_size": self._queue.qsize(),
+            }
+
+
+class CanaryRouter:
+    """
+    Sends `percent` % of live requests to a candidate model instead of the primary,
+    and tracks latency of both plus the canary's agreement with the primary.
+    """
+
+    def __init__(self, model, name: str, percent: float, label_names=None):
+        self.model = model
+        self.label_names = label_names  # the canary's own class -> label decoding
+        self.name = name
+        self.percent = min(max(percent, 0.0), 100.0)
+        self._lock = threading.Lock()
+        self._stats = {"primary": _ModelStats(), name: _ModelStats()}
+
+    def use_canary(self) -> bool:
+        return random.random() * 100 < self.percent
+
+    def record(self, model_name: str, latency: float) -> None:
+        with self._lock:
+            self._stats[model_name].record(latency)
+
+    def record_agreement(self, agree: bool) -> None:
+        with self._lock:
+            self._stats[self.name].record_agreement(agree)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model": self.name,
+                "percent": self.percent,
+                "served": {name: s.n for name, s in self._stats.items()},
+                "primary": self._stats["primary"].to_dict(with_agreement=False),
+                "canary": self._stats[self.name].to_dict(),
+            }
+
+
+def _configure() -> None:
+    global _shadow, _canary, _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+
+        if CANARY_MODEL_PATH and CANARY_PERCENT > 0:
+            name = Path(CANARY_MODEL_PATH).stem
+            model, label_names = load_model(CANARY_MODEL_PATH)
+            _canary = CanaryRouter(model, name, CANARY_PERCENT, label_names)
+            print(f"Canary model: {name} ({_canary.percent:g}% of traffic)")
+
+        paths = [p.strip() for p in SHADOW_MODEL_PATHS.split(",") if p.strip()]
+        loaded = {Path(p).stem: load_model(p) for p in paths}
+        candidates = {name: model for name, (model, _) in loaded.items()}
+        # The shadow worker also computes the canary's agreement with the primary
+        if candidates or _canary is not None:
+            _shadow = ShadowEvaluator(
+                candidates,
+                max_queue=SHADOW_QUEUE_SIZE,
+                primary=predict_risk,
+                canary=_canary,
+                label_names={name: labels for name, (_, labels) in loaded.items()},
+            )
+        if candidates:
+            print(f"Shadow models: {', '.join(candidates)}")
+
+        # Set last: other threads skip the lock once they see it
+        _configured = True
+
+
+def serve_prediction(features: dict) -> Prediction:
+    """
+    Predict for a live request: route to the canary or the primary model,
+    then hand a copy of the input to the shadow evaluator (if configured).
+    """
+    _configure()
+
+    start = time.perf_counter()
+    if _canary is not None and _canary.use_canary():
+        label, probabilities = predict_with_proba(_canary.model, features, _canary.label_names)
+        latency = time.perf_counter() - start
+        _canary.record(_canary.name, latency)
+        _shadow.submit_canary(features, label)
+        return Prediction(label, probabilities, model_version(CANARY_MODEL_PATH), latency)
+
+    label, probabilities = predict_risk_proba(features)
+    latency = time.perf_counter() - start
+    if _canary is not None:
+        _canary.record("primary", latency)
+
+    # Shadow models are always compared against the primary model's answer
+    if _shadow is not None:
+        _shadow.submit(features, label, latency)
+    return Prediction(label, probabilities, model_version(MODEL_PATH), latency)
+
+
+def shadow_stats() -> dict:
+    _configure()
+    return {
+        "shadow": _shadow.stats() if _shadow is not None else None,
+        "canary": _canary.stats() if _canary is not None else None,
+    }